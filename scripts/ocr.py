@@ -14,10 +14,12 @@ Usage:
 
 import argparse
 import base64
+import importlib.util
 import io
 import json
 import os
 import sys
+import threading
 from pathlib import Path
 
 # Optional imports handled gracefully
@@ -33,26 +35,28 @@ try:
 except ImportError:
     HAS_PIL = False
 
-try:
-    import easyocr
-    HAS_EASYOCR = True
-except ImportError:
-    HAS_EASYOCR = False
+# easyocr pulls in torch (seconds to import), so only check it's installed
+# here and import it when the reader is first built
+HAS_EASYOCR = importlib.util.find_spec("easyocr") is not None
 
 
-# Lazy-loaded easyOCR reader
+# Lazy-loaded easyOCR reader. The lock covers loading and inference, since
+# pipeline.py runs OCR pages from a thread pool and the model isn't thread-safe.
 _easyocr_reader = None
+_easyocr_lock = threading.Lock()
 
 
 def _get_easyocr_reader():
     """Lazy-initialize easyOCR reader (model loading is slow, so cache it)."""
     global _easyocr_reader
-    if _easyocr_reader is None:
-        if not HAS_EASYOCR:
-            print("ERROR: easyocr not installed. Run: pip install easyocr")
-            return None
-        print("    OCR: Loading easyOCR models (first run may be slow)...")
-        _easyocr_reader = easyocr.Reader(['ja', 'en'], gpu=False)
+    with _easyocr_lock:
+        if _easyocr_reader is None:
+            if not HAS_EASYOCR:
+                print("ERROR: easyocr not installed. Run: pip install easyocr")
+                return None
+            import easyocr
+            print("    OCR: Loading easyOCR models (first run may be slow)...")
+            _easyocr_reader = easyocr.Reader(['ja', 'en'], gpu=False)
     return _easyocr_reader
 
 
@@ -64,6 +68,26 @@ def image_to_base64(image) -> str:
     return base64.b64encode(buf.getvalue()).decode("utf-8")
 
 
+# Claude Vision downscales anything larger than this on its long edge anyway
+VISION_MAX_EDGE = 1568
+
+
+def image_to_jpeg_base64(image, max_edge: int = VISION_MAX_EDGE, quality: int = 85) -> str:
+    """Downscale (long edge <= max_edge) and JPEG-encode a PIL Image for Vision requests.
+
+    Several times smaller than a full-resolution PNG of a scanned page.
+    Vision prompts use indices/percentages, so the resize doesn't affect
+    returned positions.
+    """
+    if max(image.size) > max_edge:
+        ratio = max_edge / max(image.size)
+        image = image.resize((max(1, round(image.width * ratio)), max(1, round(image.height * ratio))),
+                             Image.LANCZOS)
+    buf = io.BytesIO()
+    image.convert("RGB").save(buf, format="JPEG", quality=quality, optimize=True)
+    return base64.b64encode(buf.getvalue()).decode("utf-8")
+
+
 def render_pdf_page(pdf_path: Path, page_num: int = 0, dpi: int = 200):
     """Render a PDF page to PIL Image."""
     if not HAS_PDF2IMAGE:
@@ -114,7 +138,8 @@ def _easyocr_detect(image) -> list:
         return []
 
     img_array = np.array(image)
-    results = reader.readtext(img_array)
+    with _easyocr_lock:
+        results = reader.readtext(img_array)
 
     detections = []
     for bbox, text, conf in results:
@@ -207,7 +232,7 @@ def _vision_filter_detections(image, detections, api_key=None):
     if not detections:
         return []
 
-    img_b64 = image_to_base64(image)
+    img_b64 = image_to_jpeg_base64(image)
 
     det_list = "\n".join(f'{i+1}. "{d["text"]}"' for i, d in enumerate(detections))
 
@@ -246,7 +271,7 @@ Return ONLY the JSON array."""
                         "type": "image",
                         "source": {
                             "type": "base64",
-                            "media_type": "image/png",
+                            "media_type": "image/jpeg",
                             "data": img_b64,
                         },
                     },
@@ -324,7 +349,7 @@ def _vision_only_extract(image, api_key=None, include_positions=True):
         print("ERROR: ANTHROPIC_API_KEY not set")
         return []
 
-    img_b64 = image_to_base64(image)
+    img_b64 = image_to_jpeg_base64(image)
     client = anthropic.Anthropic(api_key=api_key)
 
     if include_positions:
@@ -367,7 +392,7 @@ Return ONLY the JSON array, no explanation."""
                 "content": [
                     {
                         "type": "image",
-                        "source": {"type": "base64", "media_type": "image/png", "data": img_b64},
+                        "source": {"type": "base64", "media_type": "image/jpeg", "data": img_b64},
                     },
                     {"type": "text", "text": prompt}
                 ],
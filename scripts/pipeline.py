@@ -14,16 +14,32 @@ Usage:
     python pipeline.py input.pdf -o output_dir/                 # Custom output directory
     python pipeline.py input.pdf --no-llm                       # Dictionary-only mode
     python pipeline.py input.pdf --form residence_registration  # Specify form template
+    python pipeline.py input.pdf --quiet                        # Warnings/errors only
 """
 
 import argparse
 import hashlib
 import json
+import logging
 import os
+import re
 import sys
+from bisect import bisect_right
+from collections import Counter, defaultdict
 from datetime import date
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
 
+# Optional: orjson parses/dumps the (large, non-ASCII) JSON caches several times faster
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
 # ── Paths ──
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -31,6 +47,23 @@ FIELDS_PATH = DATA_DIR / "fields" / "dictionary.json"
 FORMS_DIR = DATA_DIR / "forms"
 OUTPUT_DIR = BASE_DIR / "output" / "walkthroughs"
 CACHE_PATH = BASE_DIR / "translations_cache.json"
+CACHE_LOG_PATH = BASE_DIR / "translations_cache.jsonl"  # entries appended since the last full write
+CACHE_DIR = BASE_DIR / ".cache"
+PAGE_IMAGE_CACHE_DIR = CACHE_DIR / "page_images"  # <sha1(pdf)>/<page>_<dpi>.png
+FONT_CACHE_PATH = CACHE_DIR / "font.json"  # {"path", "subfont_index"} found by register_fonts()
+
+# Effective resolution of the full-page overview images embedded in the guide
+# (zone crops keep the render DPI for legibility)
+PAGE_EMBED_DPI = 150
+
+# Section crops and mini-map thumbnails are continuous-tone scans, embedded
+# as JPEG (reportlab passes JPEG data through as DCTDecode, no re-encode)
+EMBED_JPEG_QUALITY = 82
+
+# Image-based pages are OCR'd / sent to Vision concurrently, at most this many
+# at a time (each worker mostly waits on the API, so this bounds request
+# concurrency rather than CPU)
+OCR_MAX_WORKERS = 8
 
 # ── Form zones for 住民異動届 (pdfplumber y-coordinates) ──
 # A4 page height is ~842 points. Extended to capture full page content.
@@ -104,43 +137,167 @@ def create_dynamic_zones_for_fields(fields, page_height_pts, max_fields_per_zone
     return zones
 
 
+# ═══════════════════════════════════════════
+# LOGGING
+# ═══════════════════════════════════════════
+
+class _ProgressFormatter(logging.Formatter):
+    """Bare messages; warnings and errors get their level name after the indent."""
+
+    def format(self, record):
+        message = super().format(record)
+        if record.levelno < logging.WARNING:
+            return message
+        body = message.lstrip(" ")
+        return f"{message[:len(message) - len(body)]}{record.levelname}: {body}"
+
+
+def configure_logging(quiet=False):
+    """Send pipeline progress messages to stdout through one handler.
+
+    Library code logs via `logger`; callers (the CLI, scraper.py) call this
+    once. quiet=True keeps only warnings and errors.
+    """
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_ProgressFormatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(logging.WARNING if quiet else logging.INFO)
+
+
 # ═══════════════════════════════════════════
 # DATA LOADING
 # ═══════════════════════════════════════════
 
+def loads_json(data):
+    """Parse a JSON str/bytes (orjson when installed). Raises json.JSONDecodeError."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return loads_json(Path(path).read_bytes())
 
 
+@lru_cache(maxsize=1)
 def load_field_dictionary():
-    """Load the universal field dictionary. Returns dict keyed by field_id."""
+    """Load the universal field dictionary. Returns dict keyed by field_id.
+
+    Cached for the life of the process (batch runs share one copy) — treat
+    the result as read-only.
+    """
     data = load_json(FIELDS_PATH)
     return data["fields"]
 
 
+@lru_cache(maxsize=None)
 def load_form_template(form_id):
-    """Load a form template by ID. Returns None if not found."""
+    """Load a form template by ID. Returns None if not found. Cached per form_id."""
     path = FORMS_DIR / f"{form_id}.json"
     if not path.exists():
         return None
     return load_json(path)
 
 
+_translation_cache = None
+# Cache values as last written to disk (compared by identity to find new
+# entries) and the number of lines currently in CACHE_LOG_PATH
+_cache_persisted = {}
+_cache_log_lines = 0
+
+
 def load_translation_cache():
-    """Load translation cache from disk. Returns empty dict if no file."""
+    """Load translation cache from disk. Returns empty dict if no file.
+
+    The cache is read once per process; later calls return the same dict,
+    which callers update in place and persist with save_translation_cache().
+    Entries appended to CACHE_LOG_PATH since the last full write are
+    replayed on top of CACHE_PATH.
+    """
+    global _translation_cache, _cache_persisted, _cache_log_lines
+    if _translation_cache is not None:
+        return _translation_cache
+    cache = {}
     if CACHE_PATH.exists():
         try:
-            return load_json(CACHE_PATH)
+            cache = load_json(CACHE_PATH)
         except (json.JSONDecodeError, OSError):
             pass
-    return {}
+    log_lines = 0
+    if CACHE_LOG_PATH.exists():
+        try:
+            with open(CACHE_LOG_PATH, "rb") as f:
+                for line in f:
+                    try:
+                        entry = loads_json(line)
+                    except ValueError:
+                        continue  # blank or partially written line
+                    cache[entry["k"]] = entry["v"]
+                    log_lines += 1
+        except OSError:
+            pass
+    _translation_cache = cache
+    _cache_persisted = dict(cache)
+    _cache_log_lines = log_lines
+    return _translation_cache
 
 
 def save_translation_cache(cache):
-    """Write translation cache to disk."""
-    with open(CACHE_PATH, "w", encoding="utf-8") as f:
-        json.dump(cache, f, indent=2, ensure_ascii=False)
+    """Persist new/changed translation cache entries.
+
+    Appends one JSON line per entry to CACHE_LOG_PATH instead of rewriting
+    the whole cache. The full file (CACHE_PATH) is rewritten — and the log
+    cleared — only when the log grows past twice the number of entries, or
+    when there is no full file yet.
+
+    Changes are found by identity against the dict load_translation_cache()
+    returned, so entries must be replaced (cache[key] = result), never
+    mutated in place. Any other dict is written out in full.
+    """
+    global _cache_log_lines
+    if cache is not _translation_cache:
+        compact_translation_cache(cache)
+        return
+
+    changed = [(k, v) for k, v in cache.items() if _cache_persisted.get(k) is not v]
+    if not changed:
+        return
+
+    if not CACHE_PATH.exists() or _cache_log_lines + len(changed) > 2 * len(cache):
+        compact_translation_cache(cache)
+        return
+
+    with open(CACHE_LOG_PATH, "ab") as f:
+        for k, v in changed:
+            if HAS_ORJSON:
+                f.write(orjson.dumps({"k": k, "v": v}, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+            else:
+                f.write(json.dumps({"k": k, "v": v}, ensure_ascii=False).encode("utf-8") + b"\n")
+            _cache_persisted[k] = v
+    _cache_log_lines += len(changed)
+
+
+def compact_translation_cache(cache):
+    """Rewrite the full translation cache file and clear the append log.
+
+    The written dict becomes the process-wide cache, since it is what
+    load_translation_cache() would now read back.
+    """
+    global _translation_cache, _cache_persisted, _cache_log_lines
+    tmp_path = CACHE_PATH.with_suffix(".json.tmp")
+    if HAS_ORJSON:
+        tmp_path.write_bytes(orjson.dumps(cache, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, CACHE_PATH)
+    if CACHE_LOG_PATH.exists():
+        CACHE_LOG_PATH.unlink()
+    _translation_cache = cache
+    _cache_persisted = dict(cache)
+    _cache_log_lines = 0
 
 
 # ═══════════════════════════════════════════
@@ -159,7 +316,17 @@ def register_fonts():
     from reportlab.pdfbase import pdfmetrics
     from reportlab.pdfbase.ttfonts import TTFont
 
-    # Try Windows MS Gothic, macOS Arial Unicode, then Linux IPA Gothic
+    # Font found by a previous run goes first, so the probe usually stops there
+    cached = None
+    try:
+        cached = json.loads(FONT_CACHE_PATH.read_text(encoding="utf-8"))
+        cached = (cached["path"], cached.get("subfont_index"))
+    except (OSError, ValueError, KeyError, TypeError):
+        cached = None
+
+    # Try Windows MS Gothic, macOS Arial Unicode, then Linux IPA Gothic.
+    # No need to pre-subset these: reportlab's TTFont embeds only the glyphs a
+    # document actually uses (in 256-glyph subsets), never the whole font file.
     candidates = [
         ("C:/Windows/Fonts/msgothic.ttc", 0),  # Windows MS Gothic (TTC index 0)
         ("/System/Library/Fonts/Supplemental/Arial Unicode.ttf", None),  # macOS Arial Unicode
@@ -167,6 +334,8 @@ def register_fonts():
         ("/usr/share/fonts/opentype/ipafont-gothic/ipag.ttf", None),
         ("/usr/share/fonts/truetype/fonts-japanese-gothic.ttf", None),
     ]
+    if cached:
+        candidates = [cached] + [c for c in candidates if c != cached]
 
     for font_path, subfont_index in candidates:
         if os.path.exists(font_path):
@@ -176,14 +345,21 @@ def register_fonts():
                 else:
                     pdfmetrics.registerFont(TTFont("JPFont", font_path))
                 _font_registered = True
+                if (font_path, subfont_index) != cached:
+                    try:
+                        FONT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                        FONT_CACHE_PATH.write_text(
+                            json.dumps({"path": font_path, "subfont_index": subfont_index}), encoding="utf-8")
+                    except OSError:
+                        pass  # best-effort; the probe just runs again next time
                 return True
             except Exception as e:
-                print(f"  WARN: Could not register font {font_path}: {e}")
+                logger.warning("  Could not register font %s: %s", font_path, e)
                 continue
 
-    print("  WARN: No Japanese font found. Japanese text in guide may not render correctly.")
-    print("    Windows: msgothic.ttc should be at C:/Windows/Fonts/")
-    print("    Linux: install fonts-ipafont-gothic")
+    logger.warning("  No Japanese font found. Japanese text in guide may not render correctly.\n"
+                   "    Windows: msgothic.ttc should be at C:/Windows/Fonts/\n"
+                   "    Linux: install fonts-ipafont-gothic")
     return False
 
 
@@ -219,7 +395,7 @@ def classify_pdf_pages(pdf_path, min_chars=50):
                     "height_pts": float(page.height),
                 })
     except Exception as e:
-        print(f"  WARN: Could not classify PDF: {e}")
+        logger.warning("  Could not classify PDF: %s", e)
 
     return results
 
@@ -234,15 +410,7 @@ def validate_pdf_for_form(pdf_path, form_template):
     """
     import pdfplumber
 
-    # Get validation terms: explicit field first, fall back to names.ja + aliases_ja
-    terms = form_template.get("validation_terms")
-    if not terms:
-        names = form_template.get("names", {})
-        terms = []
-        if names.get("ja"):
-            terms.append(names["ja"])
-        terms.extend(names.get("aliases_ja", []))
-
+    terms = _validation_terms(form_template)
     if not terms:
         return (True, "no validation terms defined — skipping")
 
@@ -256,6 +424,23 @@ def validate_pdf_for_form(pdf_path, form_template):
     except Exception as e:
         return (True, f"could not read PDF — skipping validation ({e})")
 
+    return _match_validation_terms(all_text, terms)
+
+
+def _validation_terms(form_template):
+    """Validation terms: explicit field first, fall back to names.ja + aliases_ja."""
+    terms = form_template.get("validation_terms")
+    if not terms:
+        names = form_template.get("names", {})
+        terms = []
+        if names.get("ja"):
+            terms.append(names["ja"])
+        terms.extend(names.get("aliases_ja", []))
+    return terms
+
+
+def _match_validation_terms(all_text, terms):
+    """Shared tail of validate_pdf_for_form: returns (passed, detail)."""
     total_chars = len(all_text)
 
     # Image-based PDFs have very little extractable text
@@ -312,79 +497,146 @@ def extract_text(pdf_path, page_num=0):
     chars = []
     with pdfplumber.open(pdf_path) as pdf:
         if page_num >= len(pdf.pages):
-            print(f"  WARN: Page {page_num} not found in {pdf_path} (has {len(pdf.pages)} pages)")
+            logger.warning("  Page %s not found in %s (has %d pages)", page_num, pdf_path, len(pdf.pages))
             return chars
 
-        page = pdf.pages[page_num]
-        for char in page.chars:
-            chars.append({
-                "text": char.get("text", ""),
-                "x0": float(char.get("x0", 0)),
-                "y0": float(char.get("top", 0)),
-                "x1": float(char.get("x1", 0)),
-                "y1": float(char.get("bottom", 0)),
-                "top": float(char.get("top", 0)),
-                "size": float(char.get("size", 10)),
-            })
+        chars = _page_chars(pdf.pages[page_num])
 
     return chars
 
 
-def cluster_fields(chars, y_threshold=3.0, x_gap_threshold=15.0):
+def _page_chars(page):
+    """Convert a pdfplumber page's chars to extract_text()'s dict format."""
+    return [
+        {
+            "text": char.get("text", ""),
+            "x0": float(char.get("x0", 0)),
+            "y0": float(char.get("top", 0)),
+            "x1": float(char.get("x1", 0)),
+            "y1": float(char.get("bottom", 0)),
+            "top": float(char.get("top", 0)),
+            "size": float(char.get("size", 10)),
+        }
+        for char in page.chars
+    ]
+
+
+def _page_char_columns(page):
     """
-    Cluster characters into logical text runs by proximity.
+    Column (SoA) form of a pdfplumber page's chars, for cluster_fields.
 
-    Groups characters that are on the same line (similar y) and close horizontally.
-    Returns list of field groups: {text, x0, y0, x1, y1, chars}
+    Returns {"text": list, "x0"/"y0"/"x1"/"y1": float64 arrays} — one array
+    per coordinate instead of a dict per character.
     """
-    if not chars:
-        return []
+    import numpy as np
 
-    # Sort by y (top), then by x
-    sorted_chars = sorted(chars, key=lambda c: (c["y0"], c["x0"]))
+    objs = page.chars
+    n = len(objs)
 
-    # Group into lines by y-proximity
-    lines = []
-    current_line = [sorted_chars[0]]
+    def column(key, default=0):
+        return np.fromiter((float(c.get(key, default)) for c in objs), dtype=np.float64, count=n)
 
-    for ch in sorted_chars[1:]:
-        if abs(ch["y0"] - current_line[-1]["y0"]) <= y_threshold:
-            current_line.append(ch)
-        else:
-            lines.append(current_line)
-            current_line = [ch]
-    lines.append(current_line)
+    return {
+        "text": [c.get("text", "") for c in objs],
+        "x0": column("x0"),
+        "y0": column("top"),
+        "x1": column("x1"),
+        "y1": column("bottom"),
+    }
 
-    # Within each line, split into field groups by x-gap
-    fields = []
-    for line in lines:
-        line_sorted = sorted(line, key=lambda c: c["x0"])
-        group = [line_sorted[0]]
-
-        for ch in line_sorted[1:]:
-            # If gap between previous char end and this char start is large, split
-            prev_end = group[-1]["x1"]
-            if ch["x0"] - prev_end > x_gap_threshold:
-                fields.append(_make_field_group(group))
-                group = [ch]
-            else:
-                group.append(ch)
-        fields.append(_make_field_group(group))
 
-    return fields
+def analyze_pdf(pdf_path, min_chars=50, include_text=False):
+    """
+    Gather everything process_pdf needs from the PDF in a single open.
 
+    Combines classify_pdf_pages(), extract_text() for every page and (with
+    include_text) the page text validate_pdf_for_form() checks, instead of
+    re-opening and re-parsing the file for each.
 
-def _make_field_group(char_list):
-    """Combine a list of character dicts into a single field group."""
-    text = "".join(c["text"] for c in char_list)
-    return {
-        "text": text,
-        "x0": min(c["x0"] for c in char_list),
-        "y0": min(c["y0"] for c in char_list),
-        "x1": max(c["x1"] for c in char_list),
-        "y1": max(c["y1"] for c in char_list),
-        "char_count": len(char_list),
-    }
+    Returns list of dicts, one per page:
+        {"page", "type", "char_count", "width_pts", "height_pts", "chars", "text"}
+    where "chars" is the column form from _page_char_columns() and "text" is
+    None unless include_text is set.
+    """
+    import pdfplumber
+
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for i, page in enumerate(pdf.pages):
+            chars = _page_char_columns(page)
+            char_count = len(chars["text"])
+            pages.append({
+                "page": i,
+                "type": "text" if char_count >= min_chars else "image",
+                "char_count": char_count,
+                "width_pts": float(page.width),
+                "height_pts": float(page.height),
+                "chars": chars,
+                "text": (page.extract_text() or "") if include_text else None,
+            })
+    return pages
+
+
+def cluster_fields(chars, y_threshold=3.0, x_gap_threshold=15.0):
+    """
+    Cluster characters into logical text runs by proximity.
+
+    Groups characters that are on the same line (similar y) and close horizontally.
+    Accepts extract_text()'s list of char dicts or the column form from
+    _page_char_columns(). Returns list of field groups: {text, x0, y0, x1, y1, char_count}
+
+    Vectorised with NumPy: line and group boundaries come from diffs over the
+    sorted coordinates, bounding boxes from reduceat over each group.
+    """
+    import numpy as np
+
+    if isinstance(chars, dict):
+        if not chars["text"]:
+            return []
+        char_texts = chars["text"]
+        x0, y0, x1, y1 = (np.asarray(chars[k], dtype=np.float64) for k in ("x0", "y0", "x1", "y1"))
+    else:
+        if not chars:
+            return []
+        char_texts = [c["text"] for c in chars]
+        x0 = np.array([c["x0"] for c in chars], dtype=np.float64)
+        y0 = np.array([c["y0"] for c in chars], dtype=np.float64)
+        x1 = np.array([c["x1"] for c in chars], dtype=np.float64)
+        y1 = np.array([c["y1"] for c in chars], dtype=np.float64)
+
+    # Sort by y (top), then by x (lexsort is stable, like sorted())
+    order = np.lexsort((x0, y0))
+
+    # Group into lines by y-proximity: a new line starts wherever the gap to
+    # the previous character's y exceeds the threshold
+    line_id = np.concatenate(([0], np.cumsum(np.diff(y0[order]) > y_threshold)))
+
+    # Within each line, order by x and split into field groups by x-gap
+    order = order[np.lexsort((x0[order], line_id))]
+    sx0, sx1 = x0[order], x1[order]
+    new_line = np.diff(line_id) != 0
+    gap = (sx0[1:] - sx1[:-1]) > x_gap_threshold
+    starts = np.concatenate(([0], np.flatnonzero(new_line | gap) + 1))
+    ends = np.append(starts[1:], len(order))
+
+    gx0 = np.minimum.reduceat(sx0, starts).tolist()
+    gy0 = np.minimum.reduceat(y0[order], starts).tolist()
+    gx1 = np.maximum.reduceat(sx1, starts).tolist()
+    gy1 = np.maximum.reduceat(y1[order], starts).tolist()
+
+    texts = [char_texts[i] for i in order.tolist()]
+    fields = []
+    for g, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        fields.append({
+            "text": "".join(texts[start:end]),
+            "x0": gx0[g],
+            "y0": gy0[g],
+            "x1": gx1[g],
+            "y1": gy1[g],
+            "char_count": end - start,
+        })
+
+    return fields
 
 
 def deduplicate_fields(fields, position_threshold=15):
@@ -392,6 +644,10 @@ def deduplicate_fields(fields, position_threshold=15):
 
     If two fields have similar x0/y0 coordinates (within threshold),
     keep only the one with more characters (likely more complete).
+
+    Kept fields are bucketed on a grid of threshold-sized cells, so each
+    field is only compared with kept fields in its own and the 8 adjacent
+    cells rather than with every kept field.
     """
     if not fields:
         return []
@@ -399,64 +655,146 @@ def deduplicate_fields(fields, position_threshold=15):
     # Sort by position for consistent ordering
     sorted_fields = sorted(fields, key=lambda f: (f["y0"], f["x0"]))
 
+    def cell_of(f):
+        return (int(f["x0"] // position_threshold), int(f["y0"] // position_threshold))
+
     kept = []
+    buckets = defaultdict(list)  # cell -> indices into kept
     for field in sorted_fields:
-        is_duplicate = False
-        for i, existing in enumerate(kept):
-            # Check if positions are very close
-            if (abs(field["x0"] - existing["x0"]) < position_threshold and
-                abs(field["y0"] - existing["y0"]) < position_threshold):
-                # Keep the one with more characters
-                if field["char_count"] > existing["char_count"]:
-                    kept[i] = field
-                is_duplicate = True
-                break
-        if not is_duplicate:
+        cx, cy = cell_of(field)
+        # The earliest kept field within threshold wins, as in a linear scan
+        match = None
+        for nx in (cx - 1, cx, cx + 1):
+            for ny in (cy - 1, cy, cy + 1):
+                for i in buckets.get((nx, ny), ()):
+                    existing = kept[i]
+                    if (abs(field["x0"] - existing["x0"]) < position_threshold and
+                        abs(field["y0"] - existing["y0"]) < position_threshold and
+                            (match is None or i < match)):
+                        match = i
+        if match is None:
+            buckets[(cx, cy)].append(len(kept))
             kept.append(field)
+        elif field["char_count"] > kept[match]["char_count"]:
+            # Keep the one with more characters (and re-bucket at its position)
+            buckets[cell_of(kept[match])].remove(match)
+            kept[match] = field
+            buckets[(cx, cy)].append(match)
 
     return kept
 
 
-def fields_in_zone(fields, zone, padding=10):
+def field_arrays(fields):
+    """
+    Column (SoA) view of a field list for the vectorised zone queries.
+
+    Returns {"y_center": float64 array, "page": float64 array} aligned with
+    fields; fields without a page get NaN, which never equals a zone page.
+    Also carries "by_y" (field indices in y-center order) and "y_sorted" so
+    each zone's y-range is found by binary search instead of a full scan.
+    """
+    import numpy as np
+
+    y_center = np.array([(f["y0"] + f["y1"]) / 2 for f in fields], dtype=np.float64)
+    by_y = np.argsort(y_center, kind="stable")
+    return {
+        "y_center": y_center,
+        "page": np.array([f["page"] if f.get("page") is not None else np.nan for f in fields],
+                         dtype=np.float64),
+        "by_y": by_y,
+        "y_sorted": y_center[by_y],
+    }
+
+
+def _zone_indices(zone, arrays, padding, use_page=True):
+    """Indices (in field order) of fields whose y-center falls within the padded zone."""
+    return _zone_page_filter(zone, arrays, _zone_y_indices(zone, arrays, padding), use_page)
+
+
+def _zone_y_indices(zone, arrays, padding):
+    """Indices (in field order) within the padded zone's y-range, on any page."""
+    import numpy as np
+
+    y_sorted = arrays["y_sorted"]
+    lo = np.searchsorted(y_sorted, zone["y_min"] - padding, side="left")
+    hi = np.searchsorted(y_sorted, zone["y_max"] + padding, side="right")
+    return np.sort(arrays["by_y"][lo:hi])
+
+
+def _zone_page_filter(zone, arrays, idx, use_page=True):
+    """Keep only the indices on the zone's page (no-op for non-page-specific zones)."""
+    zone_page = zone.get("page")  # None for non-page-specific zones
+    if use_page and zone_page is not None:
+        idx = idx[arrays["page"][idx] == zone_page]
+    return idx
+
+
+def fields_in_zone(fields, zone, padding=10, arrays=None):
     """Return field groups whose y-center falls within a zone's y-range.
 
     Args:
         padding: Extra points to add to zone boundaries to catch edge cases.
+        arrays: Optional field_arrays(fields), to reuse across zones.
 
     If zone has a 'page' attribute, only fields from that page are considered.
     """
-    result = []
-    y_min = zone["y_min"] - padding
-    y_max = zone["y_max"] + padding
-    zone_page = zone.get("page")  # None for non-page-specific zones
-
-    for f in fields:
-        # If zone is page-specific, skip fields from other pages
-        if zone_page is not None and f.get("page") != zone_page:
-            continue
+    if not fields:
+        return []
+    if arrays is None:
+        arrays = field_arrays(fields)
 
-        y_center = (f["y0"] + f["y1"]) / 2
-        if y_min <= y_center <= y_max:
-            result.append(f)
-    return result
+    return [fields[i] for i in _zone_indices(zone, arrays, padding).tolist()]
 
 
-def collect_unassigned_fields(fields, zones, padding=10):
+def collect_unassigned_fields(fields, zones, padding=10, arrays=None):
     """Find fields that don't fall into any defined zone.
 
     Returns a synthetic zone dict and list of unassigned fields.
     Useful for capturing content outside standard zone definitions.
     """
-    assigned = set()
+    if not fields:
+        return None, []
+    if arrays is None:
+        arrays = field_arrays(fields)
+    import numpy as np
+
+    assigned = np.zeros(len(fields), dtype=bool)
     for zone in zones:
-        y_min = zone["y_min"] - padding
-        y_max = zone["y_max"] + padding
-        for i, f in enumerate(fields):
-            y_center = (f["y0"] + f["y1"]) / 2
-            if y_min <= y_center <= y_max:
-                assigned.add(i)
-
-    unassigned = [f for i, f in enumerate(fields) if i not in assigned]
+        assigned[_zone_indices(zone, arrays, padding, use_page=False)] = True
+
+    return _catch_zone(fields, assigned)
+
+
+def assign_fields_to_zones(fields, zones, padding=10, arrays=None):
+    """Split fields across zones with one range search per zone.
+
+    Returns (zone_fields, catch_zone, unassigned), where zone_fields[i] is
+    fields_in_zone(fields, zones[i]) and catch_zone/unassigned are what
+    collect_unassigned_fields(fields, zones) returns. Each zone's y-range is
+    searched once and serves both, instead of once per zone for each.
+    """
+    if not fields:
+        return [[] for _ in zones], None, []
+    if arrays is None:
+        arrays = field_arrays(fields)
+    import numpy as np
+
+    assigned = np.zeros(len(fields), dtype=bool)
+    zone_fields = []
+    for zone in zones:
+        idx = _zone_y_indices(zone, arrays, padding)
+        assigned[idx] = True  # page-agnostic, as in collect_unassigned_fields
+        zone_fields.append([fields[i] for i in _zone_page_filter(zone, arrays, idx).tolist()])
+
+    catch_zone, unassigned = _catch_zone(fields, assigned)
+    return zone_fields, catch_zone, unassigned
+
+
+def _catch_zone(fields, assigned):
+    """Catch-all zone and field list for the fields not marked in assigned."""
+    import numpy as np
+
+    unassigned = [fields[i] for i in np.flatnonzero(~assigned).tolist()]
     if not unassigned:
         return None, []
 
@@ -489,22 +827,27 @@ def ocr_with_vision(page_image, page_height_pts=842):
 
     try:
         import anthropic
-        import base64
         import json
-        import io
     except ImportError:
-        print("  WARN: anthropic package not installed. Skipping OCR.")
+        logger.warning("  anthropic package not installed. Skipping OCR.")
         return []
 
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
         return []
 
-    # Convert image to base64
-    img_buf = io.BytesIO()
-    page_image.save(img_buf, format="PNG")
-    img_buf.seek(0)
-    img_b64 = base64.b64encode(img_buf.getvalue()).decode("utf-8")
+    # Convert image to base64 JPEG, downscaled to Vision's own size limit —
+    # positions come back as percentages, so the resize is harmless
+    try:
+        from ocr import image_to_jpeg_base64
+    except ImportError:
+        # Try relative import
+        import sys
+        scripts_dir = Path(__file__).parent
+        if str(scripts_dir) not in sys.path:
+            sys.path.insert(0, str(scripts_dir))
+        from ocr import image_to_jpeg_base64
+    img_b64 = image_to_jpeg_base64(page_image)
 
     # Scale factor: image pixels to PDF points
     img_height = page_image.size[1]
@@ -513,7 +856,7 @@ def ocr_with_vision(page_image, page_height_pts=842):
     client = anthropic.Anthropic(api_key=api_key)
 
     try:
-        print("    OCR: Extracting text from scanned form...")
+        logger.info("    OCR: Extracting text from scanned form...")
         response = client.messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=4096,
@@ -524,7 +867,7 @@ def ocr_with_vision(page_image, page_height_pts=842):
                         "type": "image",
                         "source": {
                             "type": "base64",
-                            "media_type": "image/png",
+                            "media_type": "image/jpeg",
                             "data": img_b64,
                         },
                     },
@@ -554,7 +897,7 @@ Return ONLY the JSON array, no other text."""
             if text.startswith("json"):
                 text = text[4:]
 
-        items = json.loads(text)
+        items = loads_json(text)
 
         # Convert to field groups format
         fields = []
@@ -581,11 +924,11 @@ Return ONLY the JSON array, no other text."""
                 "char_count": len(item["text"]),
             })
 
-        print(f"    OCR: Found {len(fields)} text fields")
+        logger.info("    OCR: Found %d text fields", len(fields))
         return fields
 
     except Exception as e:
-        print(f"  WARN: OCR failed: {e}")
+        logger.warning("  OCR failed: %s", e)
         return []
 
 
@@ -630,21 +973,22 @@ def ocr_extract_translate_locate(
             sys.path.insert(0, str(scripts_dir))
         from ocr import extract_text_from_image
 
-    stats = {"dict_hits": 0, "frag_hits": 0, "llm_hits": 0, "unknown": 0}
+    type_counts = Counter()
 
     # Step 1: Extract Japanese text WITH positions (easyOCR + dictionary + Vision)
-    print("    OCR: Extracting text and positions...")
+    logger.info("    OCR: Extracting text and positions...")
     items = extract_text_from_image(page_image, include_positions=True,
                                     dictionary=dictionary)
 
     if not items:
-        print("    OCR: No text found")
-        return [], stats
+        logger.info("    OCR: No text found")
+        return [], {"dict_hits": 0, "frag_hits": 0, "llm_hits": 0, "unknown": 0}
 
-    print(f"    OCR: Found {len(items)} text items with positions")
+    logger.info("    OCR: Found %d text items with positions", len(items))
 
-    # Step 2: Translate and build fields
-    print("    OCR: Translating...")
+    # Step 2: Locate fields, then translate them all at once (one batched
+    # LLM request for every label the dictionary/cache can't resolve)
+    logger.info("    OCR: Translating...")
     fields = []
 
     for item in items:
@@ -664,41 +1008,32 @@ def ocr_extract_translate_locate(
         x_center = (x_pct / 100) * page_width_pts
         y_center = (y_pct / 100) * page_height_pts
 
-        x0 = x_center - width_pts / 2
-        y0 = y_center - height_pts / 2
-        x1 = x_center + width_pts / 2
-        y1 = y_center + height_pts / 2
-
-        # Translate
-        result = translate_field(ja_text, cache, dictionary, use_llm=use_llm)
-
-        # Track stats
-        t = result.get("type", "")
-        if t == "dictionary":
-            stats["dict_hits"] += 1
-        elif t == "fragment":
-            stats["frag_hits"] += 1
-        elif t == "llm":
-            stats["llm_hits"] += 1
-        elif t == "unknown":
-            stats["unknown"] += 1
-
         fields.append({
             "text": ja_text,
-            "x0": x0,
-            "y0": y0,
-            "x1": x1,
-            "y1": y1,
+            "x0": x_center - width_pts / 2,
+            "y0": y_center - height_pts / 2,
+            "x1": x_center + width_pts / 2,
+            "y1": y_center + height_pts / 2,
             "char_count": len(ja_text),
-            "translation": {
-                "ja": ja_text,
-                "en": result.get("en", ""),
-                "type": result.get("type", "unknown"),
-                "note": result.get("note", ""),
-            },
         })
 
-    print(f"    OCR: Processed {len(fields)} fields")
+    results = translate_fields_batch([f["text"] for f in fields], cache, dictionary, use_llm=use_llm)
+    for field, result in zip(fields, results):
+        type_counts[result.get("type", "")] += 1
+        field["translation"] = {
+            "ja": field["text"],
+            "en": result.get("en", ""),
+            "type": result.get("type", "unknown"),
+            "note": result.get("note", ""),
+        }
+
+    logger.info("    OCR: Processed %d fields", len(fields))
+    stats = {
+        "dict_hits": type_counts["dictionary"],
+        "frag_hits": type_counts["fragment"],
+        "llm_hits": type_counts["llm"],
+        "unknown": type_counts["unknown"],
+    }
     return fields, stats
 
 
@@ -706,46 +1041,112 @@ def ocr_extract_translate_locate(
 # TRANSLATION LAYER
 # ═══════════════════════════════════════════
 
+# Lookup indexes for dictionary_lookup / fragment_match, rebuilt only when a
+# different dictionary object is passed in: (dictionary, reverse, fragments, tips)
+_dictionary_indexes = (None, {}, {}, ({}, {}))
+
+
+def build_reverse_index(dictionary):
+    """
+    Map every kanji, alias and option key to (field_id, opt_key).
+
+    opt_key is None for kanji/alias entries. Entries are inserted in the
+    order dictionary_lookup used to scan them (per field: kanji, aliases,
+    options), keeping the first occurrence, so precedence is unchanged.
+    """
+    index = {}
+    for field_id, field in dictionary.items():
+        kanji = field.get("kanji", "")
+        if kanji:
+            index.setdefault(kanji, (field_id, None))
+        for alias in field.get("aliases", []):
+            index.setdefault(alias, (field_id, None))
+        for opt_key in field.get("options", {}):
+            index.setdefault(opt_key, (field_id, opt_key))
+    return index
+
+
+def build_fragment_index(dictionary):
+    """
+    Group dictionary kanji by first character for fragment_match.
+
+    Returns {first_char: [(kanji, order, field_id), ...]} where order is the
+    field's position in the dictionary (used to break length ties the same
+    way the original linear scan did).
+    """
+    index = {}
+    for order, (field_id, field) in enumerate(dictionary.items()):
+        kanji = field.get("kanji", "")
+        if kanji:
+            index.setdefault(kanji[0], []).append((kanji, order, field_id))
+    return index
+
+
+def build_tip_index(dictionary):
+    """
+    Index tip_en for resolve_explanations().
+
+    Returns (kanji_tips, label_tips): kanji_tips maps each kanji to the tip
+    of the first field with that kanji (used for fragment parts); label_tips
+    also covers aliases, but only where the alias's field has a tip — the
+    same precedence as the original scan over dictionary.items().
+    """
+    kanji_tips = {}
+    label_tips = {}
+    for field in dictionary.values():
+        tip = field.get("tip_en", "")
+        kanji = field.get("kanji", "")
+        kanji_tips.setdefault(kanji, tip)
+        label_tips.setdefault(kanji, tip)
+        if tip:
+            for alias in field.get("aliases", []):
+                label_tips.setdefault(alias, tip)
+    return kanji_tips, label_tips
+
+
+def _get_indexes(dictionary):
+    global _dictionary_indexes
+    if _dictionary_indexes[0] is not dictionary:
+        _dictionary_indexes = (dictionary, build_reverse_index(dictionary), build_fragment_index(dictionary),
+                               build_tip_index(dictionary))
+    return _dictionary_indexes
+
+
+def _get_reverse_index(dictionary):
+    return _get_indexes(dictionary)[1]
+
+
 def dictionary_lookup(text, dictionary):
     """
     Look up text in the field dictionary.
 
-    Tries exact kanji match first, then checks aliases.
+    Tries exact kanji match first, then checks aliases and option labels
+    (a single probe of the reverse index built by build_reverse_index).
     Returns dict {en, type, note} or None.
     """
     text = text.strip()
     if not text:
         return None
 
-    for field_id, field in dictionary.items():
-        # Exact kanji match
-        if text == field.get("kanji", ""):
-            return {
-                "en": field["english"],
-                "type": "dictionary",
-                "note": field.get("tip_en", ""),
-                "field_id": field_id,
-            }
-        # Check aliases
-        for alias in field.get("aliases", []):
-            if text == alias:
-                return {
-                    "en": field["english"],
-                    "type": "dictionary",
-                    "note": field.get("tip_en", ""),
-                    "field_id": field_id,
-                }
-        # Check options
-        for opt_key, opt_val in field.get("options", {}).items():
-            if text == opt_key:
-                return {
-                    "en": opt_val["english"],
-                    "type": "dictionary",
-                    "note": f"Option for {field['english']}",
-                    "field_id": field_id,
-                }
+    hit = _get_reverse_index(dictionary).get(text)
+    if hit is None:
+        return None
 
-    return None
+    field_id, opt_key = hit
+    field = dictionary[field_id]
+    if opt_key is not None:
+        return {
+            "en": field["options"][opt_key]["english"],
+            "type": "dictionary",
+            "note": f"Option for {field['english']}",
+            "field_id": field_id,
+        }
+    return {
+        "en": field["english"],
+        "type": "dictionary",
+        "note": field.get("tip_en", ""),
+        "field_id": field_id,
+    }
 
 
 def fragment_match(text, dictionary):
@@ -759,23 +1160,28 @@ def fragment_match(text, dictionary):
     if not text or len(text) < 2:
         return None
 
-    # Try to find any dictionary kanji that is a substring
-    matches = []
-    for field_id, field in dictionary.items():
-        kanji = field.get("kanji", "")
-        if kanji and kanji in text:
-            matches.append({
-                "kanji": kanji,
-                "english": field["english"],
-                "field_id": field_id,
-                "length": len(kanji),
-            })
+    # Find every dictionary kanji that is a substring: one pass over the
+    # text, only testing kanji that start with the character at each position
+    fragment_index = _get_indexes(dictionary)[2]
+    found = {}
+    for i, ch in enumerate(text):
+        for kanji, order, field_id in fragment_index.get(ch, ()):
+            if order not in found and text.startswith(kanji, i):
+                found[order] = (kanji, field_id)
 
-    if not matches:
+    if not found:
         return None
 
-    # Sort by length descending — prefer longest match
-    matches.sort(key=lambda m: m["length"], reverse=True)
+    # Sort by length descending — prefer longest match (dictionary order on ties)
+    matches = [
+        {
+            "kanji": kanji,
+            "english": dictionary[field_id]["english"],
+            "field_id": field_id,
+            "length": len(kanji),
+        }
+        for order, (kanji, field_id) in sorted(found.items(), key=lambda item: (-len(item[1][0]), item[0]))
+    ]
 
     # Build combined translation
     parts = [m["english"] for m in matches[:3]]  # limit to 3 parts
@@ -788,6 +1194,10 @@ def fragment_match(text, dictionary):
     }
 
 
+# "Translation: ..." / "Tip: ..." lines of llm_translate()'s reply
+_LLM_REPLY_LINE_RE = re.compile(r"^[^\S\n]*(translation|tip):(.*)$", re.IGNORECASE | re.MULTILINE)
+
+
 def llm_translate(text, use_llm=True):
     """
     Translate text using Claude Sonnet API.
@@ -804,7 +1214,7 @@ def llm_translate(text, use_llm=True):
     try:
         import anthropic
     except ImportError:
-        print("  WARN: anthropic package not installed. Skipping LLM translation.")
+        logger.warning("  anthropic package not installed. Skipping LLM translation.")
         return None
 
     try:
@@ -827,47 +1237,138 @@ def llm_translate(text, use_llm=True):
             ],
         )
         raw = message.content[0].text.strip()
-        # Parse structured response
-        translation = raw
-        tip = ""
-        for line in raw.split("\n"):
-            line = line.strip()
-            if line.lower().startswith("translation:"):
-                translation = line.split(":", 1)[1].strip()
-            elif line.lower().startswith("tip:"):
-                tip = line.split(":", 1)[1].strip()
-                if tip.lower() in ("n/a", "none", "n/a."):
-                    tip = ""
+        # Parse structured response (last "Translation:"/"Tip:" line wins)
+        parsed = {m.group(1).lower(): m.group(2).strip() for m in _LLM_REPLY_LINE_RE.finditer(raw)}
+        translation = parsed.get("translation", raw)
+        tip = parsed.get("tip", "")
+        if tip.lower() in ("n/a", "none", "n/a."):
+            tip = ""
         return {
             "en": translation,
             "type": "llm",
             "note": tip,
         }
     except Exception as e:
-        print(f"  WARN: LLM translation failed for '{text}': {e}")
+        logger.warning("  LLM translation failed for '%s': %s", text, e)
         return None
 
 
-def translate_field(text, cache, dictionary, use_llm=True):
+LLM_BATCH_SIZE = 40  # labels per batched request (keeps replies well under max_tokens)
+
+
+def llm_translate_batch(texts, use_llm=True):
     """
-    Translate a Japanese text field. Tries in order:
+    Translate many texts with one Claude request per LLM_BATCH_SIZE labels.
+
+    Returns dict mapping text -> {en, type, note}. Texts missing from the
+    reply (or from a failed request) are simply absent; callers fall back to
+    llm_translate() for those.
+    """
+    if not use_llm or not texts:
+        return {}
+
+    api_key = os.environ.get("ANTHROPIC_API_KEY", "")
+    if not api_key:
+        return {}
+
+    try:
+        import anthropic
+    except ImportError:
+        logger.warning("  anthropic package not installed. Skipping LLM translation.")
+        return {}
+
+    client = anthropic.Anthropic(api_key=api_key)
+    results = {}
+    for start in range(0, len(texts), LLM_BATCH_SIZE):
+        chunk = texts[start:start + LLM_BATCH_SIZE]
+        labels = "\n".join(json.dumps({"id": i, "ja": t}, ensure_ascii=False) for i, t in enumerate(chunk))
+        try:
+            message = client.messages.create(
+                model="claude-sonnet-4-20250514",
+                max_tokens=150 * len(chunk) + 200,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": (
+                            f"Translate these Japanese government form labels/texts to English. "
+                            f"Context: they appear on a municipal residence registration form (住民異動届).\n\n"
+                            f"{labels}\n\n"
+                            f"Reply with ONLY a JSON array, one object per label:\n"
+                            f'[{{"id": 0, "en": "<english translation>", '
+                            f'"tip": "<brief filling tip for a foreign resident, or N/A if it\'s just instructions/layout text>"}}]'
+                        ),
+                    }
+                ],
+            )
+            raw = message.content[0].text.strip()
+
+            # Handle markdown-fenced JSON
+            if raw.startswith("```"):
+                lines = raw.split("\n")
+                if lines[0].startswith("```"):
+                    lines = lines[1:]
+                if lines and lines[-1].strip() == "```":
+                    lines = lines[:-1]
+                raw = "\n".join(lines)
+
+            for row in loads_json(raw):
+                idx = row.get("id")
+                if not isinstance(idx, int) or not 0 <= idx < len(chunk) or not row.get("en"):
+                    continue
+                tip = str(row.get("tip") or "").strip()
+                if tip.lower() in ("n/a", "none", "n/a."):
+                    tip = ""
+                results[chunk[idx]] = {
+                    "en": str(row["en"]).strip(),
+                    "type": "llm",
+                    "note": tip,
+                }
+        except Exception as e:
+            logger.warning("  Batched LLM translation failed for %d labels: %s", len(chunk), e)
+
+    return results
+
+
+# ASCII digits/punctuation/whitespace only (ASCII minus letters)
+_ASCII_NON_ALPHA_RE = re.compile(r"[\x00-\x40\x5b-\x60\x7b-\x7f]*")
+# Kana, kanji (incl. ext. A / compatibility, 々) and half-width katakana
+_JP_CHAR_RE = re.compile(r"[\u3005\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f]")
+
+
+@lru_cache(maxsize=8192)
+def translation_cache_key(text):
+    """Cache key for a (stripped) field text.
+
+    Stays MD5 so the existing translations_cache.json — mostly paid LLM
+    results — keeps matching; keys are memoised because the same labels
+    recur on every form in a batch run.
+    """
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def resolve_local(text, cache, dictionary):
+    """
+    Translate text without calling the LLM. Tries in order:
     1. Cache hit (by MD5 hash)
     2. Dictionary exact match
     3. Fragment matching
-    4. LLM translation (if enabled)
 
-    Updates cache in-place. Returns dict {en, type, note}.
+    Text with no Japanese characters at all stops after the dictionary step
+    and passes through untranslated (it never goes to the LLM).
+
+    Updates cache in-place. Returns dict {en, type, note}, or None when the
+    text still needs an LLM translation.
     """
     text = text.strip()
     if not text:
         return {"en": "", "type": "empty", "note": ""}
 
     # Skip if clearly not Japanese (pure numbers, punctuation, etc.)
-    if all(c.isascii() and not c.isalpha() for c in text):
+    if _ASCII_NON_ALPHA_RE.fullmatch(text):
         return {"en": text, "type": "passthrough", "note": "ASCII/numeric"}
 
     # Check cache
-    cache_key = hashlib.md5(text.encode("utf-8")).hexdigest()
+    cache_key = translation_cache_key(text)
     if cache_key in cache:
         return cache[cache_key]
 
@@ -877,20 +1378,76 @@ def translate_field(text, cache, dictionary, use_llm=True):
         cache[cache_key] = result
         return result
 
+    # Already English/romaji (e.g. bilingual forms) — nothing to translate
+    if _JP_CHAR_RE.search(text) is None:
+        return {"en": text, "type": "passthrough", "note": "No Japanese text"}
+
     # Fragment matching
     result = fragment_match(text, dictionary)
     if result:
         cache[cache_key] = result
         return result
 
+    return None
+
+
+def _unknown_translation(text):
+    return {"en": f"[{text}]", "type": "unknown", "note": "No translation available"}
+
+
+def translate_field(text, cache, dictionary, use_llm=True):
+    """
+    Translate a Japanese text field. Tries in order:
+    1. Cache hit (by MD5 hash)
+    2. Dictionary exact match
+    3. Fragment matching
+    4. LLM translation (if enabled)
+
+    Updates cache in-place. Returns dict {en, type, note}.
+    """
+    result = resolve_local(text, cache, dictionary)
+    if result:
+        return result
+
     # LLM fallback
+    text = text.strip()
     result = llm_translate(text, use_llm=use_llm)
     if result:
-        cache[cache_key] = result
+        cache[translation_cache_key(text)] = result
         return result
 
     # No translation found
-    return {"en": f"[{text}]", "type": "unknown", "note": "No translation available"}
+    return _unknown_translation(text)
+
+
+def translate_fields_batch(texts, cache, dictionary, use_llm=True):
+    """
+    Translate a list of texts, sending every local miss to the LLM together.
+
+    Same lookup order and caching as translate_field(), but the texts that
+    need Claude are deduplicated and sent via llm_translate_batch() instead of
+    one request each. Returns a list of {en, type, note} aligned with texts.
+    Repeated labels (person-table columns, per-page headers) are resolved
+    once and share the result.
+    """
+    local = {}
+    for text in texts:
+        if text not in local:
+            local[text] = resolve_local(text, cache, dictionary)
+    results = [local[text] for text in texts]
+
+    misses = list(dict.fromkeys(text.strip() for text, r in zip(texts, results) if r is None))
+    llm_results = llm_translate_batch(misses, use_llm=use_llm)
+    for text in misses:
+        result = llm_results.get(text) or llm_translate(text, use_llm=use_llm)
+        if result:
+            cache[translation_cache_key(text)] = result
+            llm_results[text] = result
+
+    return [
+        r if r is not None else (llm_results.get(text.strip()) or _unknown_translation(text.strip()))
+        for text, r in zip(texts, results)
+    ]
 
 
 # ═══════════════════════════════════════════
@@ -934,17 +1491,74 @@ def _find_poppler_path():
     return None
 
 
-def render_page_image(pdf_path, page_num=0, dpi=200):
+@lru_cache(maxsize=64)
+def _file_sha1(path, mtime_ns, size):
+    """SHA-1 of a file's contents (mtime/size are part of the memo key only)."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _page_image_cache_path(pdf_path, page_num, dpi):
+    stat = os.stat(pdf_path)
+    pdf_hash = _file_sha1(str(pdf_path), stat.st_mtime_ns, stat.st_size)
+    return PAGE_IMAGE_CACHE_DIR / pdf_hash / f"{page_num}_{dpi}.png"
+
+
+def _cached_page_image_path(pdf_path, page_num, dpi):
+    """Path of an existing cached render for this page, or None."""
+    try:
+        cache_file = _page_image_cache_path(pdf_path, page_num, dpi)
+    except OSError:
+        return None
+    return cache_file if cache_file.exists() else None
+
+
+@lru_cache(maxsize=2)
+def _load_page_image(path):
+    """
+    Decode a cached page render on demand for generate_guide.
+
+    Only the last two pages stay resident, so long forms are not held fully
+    decoded for the whole build; the guide visits pages in order (overview,
+    then zones), which keeps one- and two-page forms to a single decode.
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.load()
+        return img.copy() if img.mode == "RGB" else img.convert("RGB")
+
+
+def render_page_image(pdf_path, page_num=0, dpi=200, use_cache=True):
     """
     Render a PDF page as a PIL Image using pdf2image.
 
+    Renders are cached as PNGs under PAGE_IMAGE_CACHE_DIR, keyed by the PDF's
+    content hash, page and DPI, so re-running the same PDF skips poppler.
+    Pass use_cache=False to always re-render (and not write the cache).
+
     Returns PIL Image or None on failure.
     """
+    cache_file = None
+    if use_cache:
+        try:
+            cache_file = _page_image_cache_path(pdf_path, page_num, dpi)
+            if cache_file.exists():
+                from PIL import Image
+                with Image.open(cache_file) as cached:
+                    cached.load()
+                    return cached.copy() if cached.mode == "RGB" else cached.convert("RGB")
+        except Exception:
+            pass  # unreadable PDF path or corrupt cache file — render normally
+
     try:
         from pdf2image import convert_from_path
     except ImportError:
-        print("  WARN: pdf2image not installed. Skipping image rendering.")
-        print("    Install with: pip install pdf2image")
+        logger.warning("  pdf2image not installed. Skipping image rendering.\n"
+                       "    Install with: pip install pdf2image")
         return None
 
     poppler_path = _find_poppler_path()
@@ -955,13 +1569,23 @@ def render_page_image(pdf_path, page_num=0, dpi=200):
     try:
         images = convert_from_path(pdf_path, **kwargs)
         if images:
+            if cache_file is not None:
+                try:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_file = cache_file.with_suffix(".png.tmp")
+                    images[0].save(tmp_file, format="PNG", compress_level=1)
+                    os.replace(tmp_file, cache_file)
+                except OSError as e:
+                    logger.warning("  Could not cache page image: %s", e)
             return images[0]
     except Exception as e:
-        print(f"  WARN: Could not render page image: {e}")
         if sys.platform == "win32" and "poppler" in str(e).lower():
-            print("    Windows requires poppler. Install from:")
-            print("    https://github.com/oschwartz10612/poppler-windows/releases")
-            print("    Then set POPPLER_PATH environment variable to the bin/ directory.")
+            logger.warning("  Could not render page image: %s\n"
+                           "    Windows requires poppler. Install from:\n"
+                           "    https://github.com/oschwartz10612/poppler-windows/releases\n"
+                           "    Then set POPPLER_PATH environment variable to the bin/ directory.", e)
+        else:
+            logger.warning("  Could not render page image: %s", e)
     return None
 
 
@@ -998,7 +1622,31 @@ def crop_section(page_image, zone, page_height_pts, image_height_px):
 # ANNOTATED IMAGE + EXPLANATIONS
 # ═══════════════════════════════════════════
 
-def annotate_section_image(cropped_image, zone_translations, zone, page_height_pts, image_height_px):
+# Candidate circle offsets from a field, nearest ring first. Search directions:
+# upper-left, up, upper-right, left, right, lower-left, down, lower-right
+_CIRCLE_SEARCH_OFFSETS = [
+    (ddx * dist, ddy * dist)
+    for dist in (18, 28, 40, 55, 70, 90)
+    for (ddx, ddy) in ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+]
+
+
+@lru_cache(maxsize=1)
+def _number_font():
+    """Font for the numbered circles (probed once per process, not per zone)."""
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype("arial.ttf", 14)
+    except (OSError, IOError):
+        try:
+            return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 14)
+        except (OSError, IOError):
+            return ImageFont.load_default()
+
+
+def annotate_section_image(cropped_image, zone_translations, zone, page_height_pts, image_height_px,
+                           page_gray=None):
     """
     Draw numbered red circles in nearby white space with routed leader lines.
 
@@ -1012,13 +1660,16 @@ def annotate_section_image(cropped_image, zone_translations, zone, page_height_p
         zone: zone dict with y_min, y_max
         page_height_pts: full PDF page height in points
         image_height_px: full rendered page image height in pixels
+        page_gray: optional grayscale ndarray of the full page image the crop
+            came from; sliced instead of converting the crop (share it
+            across every zone of a page)
 
     Returns:
         (annotated_image, numbered_entries) where numbered_entries is
         [(number, translation_entry), ...] sorted by reading order.
     """
-    from PIL import Image, ImageDraw, ImageFont
-    import math
+    from PIL import ImageDraw
+    import numpy as np
 
     if cropped_image is None or not zone_translations:
         return cropped_image, []
@@ -1034,25 +1685,40 @@ def annotate_section_image(cropped_image, zone_translations, zone, page_height_p
     sorted_trans = sorted(zone_translations, key=lambda t: (t.get("y0", 0), t.get("x0", 0)))
 
     # --- Step 1: Build occupancy reference from grayscale ---
-    gray = cropped_image.convert("L")
-    img_w, img_h = gray.size
-    gray_pixels = gray.load()
+    # (img_h, img_w) uint8, for the vectorised samplers
+    img_w, img_h = cropped_image.size
+    gray_np = None
+    if page_gray is not None:
+        gray_np = page_gray[crop_y_top_px:crop_y_top_px + img_h, :img_w]
+        if gray_np.shape != (img_h, img_w):
+            gray_np = None  # not the page this crop came from
+    if gray_np is None:
+        gray_np = np.asarray(cropped_image.convert("L"))
+
+    # Circle-area sample grid: every 3rd pixel within the radius, relative to
+    # the circle's top-left corner
+    sample_off = np.arange(-radius, radius + 1, 3)
+    circle_mask = sample_off[:, None] ** 2 + sample_off[None, :] ** 2 <= radius * radius
+    circle_total = int(circle_mask.sum())
+    # Most dark samples a clear circle may contain (dark fraction <= 12%)
+    circle_max_dark = max(d for d in range(circle_total + 1) if d / circle_total <= 0.12)
 
     # Work directly on the original image dimensions (no gutter)
-    annotated = cropped_image.convert("RGBA")
+    # Drawing on RGBA replaces pixels (the fill alphas never blended) and the
+    # alpha was dropped on return, so draw straight onto an RGB copy instead
+    # of round-tripping the whole crop through RGBA
+    annotated = cropped_image.convert("RGB")
     draw = ImageDraw.Draw(annotated)
 
-    # Try to load a font for the numbers
-    try:
-        num_font = ImageFont.truetype("arial.ttf", 14)
-    except (OSError, IOError):
-        try:
-            num_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 14)
-        except (OSError, IOError):
-            num_font = ImageFont.load_default()
+    num_font = _number_font()
 
-    # List of placed circle centers for overlap avoidance
-    occupied_circles = []
+    # Placed circle centers for overlap avoidance, bucketed on a grid of
+    # min-distance cells so a candidate only checks its 3x3 neighbourhood
+    min_dist = 2 * radius + 4
+    min_dist_sq = min_dist ** 2
+    occupied_grid = defaultdict(list)  # (cx // min_dist, cy // min_dist) -> [(cx, cy), ...]
+    # Circles this close to their field get no leader line / anchor dot
+    leader_min_sq = (radius + 5) ** 2
 
     # --- Helper: check if a circle position is clear ---
     def _circle_clear(cx, cy):
@@ -1061,40 +1727,30 @@ def annotate_section_image(cropped_image, zone_translations, zone, page_height_p
             return False
         if cy - radius < 0 or cy + radius >= img_h:
             return False
-        # No overlap with already-placed circles
-        min_dist = 2 * radius + 4
-        for (ox, oy) in occupied_circles:
-            if math.hypot(cx - ox, cy - oy) < min_dist:
-                return False
+        # No overlap with already-placed circles (squared distances, no sqrt)
+        gx, gy = cx // min_dist, cy // min_dist
+        for nx in (gx - 1, gx, gx + 1):
+            for ny in (gy - 1, gy, gy + 1):
+                for (ox, oy) in occupied_grid.get((nx, ny), ()):
+                    dx = cx - ox
+                    dy = cy - oy
+                    if dx * dx + dy * dy < min_dist_sq:
+                        return False
         # Sample pixels within circle area; reject if too many are dark
-        dark_count = 0
-        total_count = 0
-        for sy in range(cy - radius, cy + radius + 1, 3):
-            for sx in range(cx - radius, cx + radius + 1, 3):
-                if (sx - cx) ** 2 + (sy - cy) ** 2 <= radius * radius:
-                    total_count += 1
-                    if gray_pixels[sx, sy] < DARK_THRESHOLD:
-                        dark_count += 1
-        if total_count == 0:
-            return False
-        return (dark_count / total_count) <= 0.12
+        sub = gray_np[cy - radius:cy + radius + 1:3, cx - radius:cx + radius + 1:3]
+        return np.count_nonzero((sub < DARK_THRESHOLD) & circle_mask) <= circle_max_dark
 
     # --- Helper: measure dark-pixel fraction along a line segment ---
-    def _line_darkness(x1, y1, x2, y2):
-        n_samples = 80
-        dark = 0
-        total = 0
-        dx = x2 - x1
-        dy = y2 - y1
-        for i in range(n_samples + 1):
-            t = i / n_samples
-            sx = int(x1 + dx * t)
-            sy = int(y1 + dy * t)
-            if 0 <= sx < img_w and 0 <= sy < img_h:
-                total += 1
-                if gray_pixels[sx, sy] < DARK_THRESHOLD:
-                    dark += 1
-        return dark / total if total > 0 else 1.0
+    def _line_pixels(x1, y1, x2, y2):
+        # Bresenham rasterisation in closed form: one sample per pixel the
+        # segment covers (step i along the major axis, minor axis offset
+        # rounded in integer arithmetic)
+        dx, dy = x2 - x1, y2 - y1
+        n = max(abs(dx), abs(dy), 1)
+        steps = np.arange(max(abs(dx), abs(dy)) + 1)
+        sx = x1 + (1 if dx >= 0 else -1) * ((2 * steps * abs(dx) + n) // (2 * n))
+        sy = y1 + (1 if dy >= 0 else -1) * ((2 * steps * abs(dy) + n) // (2 * n))
+        return sx, sy
 
     # --- Helper: pick best route (direct, L-horiz-first, L-vert-first) ---
     def _best_route(cx, cy, fx, fy):
@@ -1106,91 +1762,97 @@ def annotate_section_image(cropped_image, zone_translations, zone, page_height_p
             # L-shape vertical-first: circle → (cx, fy) → field
             [(cx, cy), (cx, fy), (fx, fy)],
         ]
+        # Rasterise all five segments, sample them in one gather, then split
+        # the dark / in-bounds counts back out per segment
+        segments = [_line_pixels(*route[j], *route[j + 1]) for route in routes for j in range(len(route) - 1)]
+        sx = np.concatenate([seg[0] for seg in segments])
+        sy = np.concatenate([seg[1] for seg in segments])
+        starts = np.cumsum([0] + [len(seg[0]) for seg in segments[:-1]])
+        inside = (sx >= 0) & (sx < img_w) & (sy >= 0) & (sy < img_h)
+        dark = np.zeros(len(sx), dtype=bool)
+        dark[inside] = gray_np[sy[inside], sx[inside]] < DARK_THRESHOLD
+        totals = np.add.reduceat(inside.astype(np.int64), starts).tolist()
+        darks = np.add.reduceat(dark.astype(np.int64), starts).tolist()
+        # Dark-pixel fraction per segment (fully off-image counts as dark)
+        seg_darkness = iter([d / t if t > 0 else 1.0 for d, t in zip(darks, totals)])
+
         best = None
         best_score = float("inf")
         for route in routes:
             score = 0.0
             for j in range(len(route) - 1):
-                score += _line_darkness(route[j][0], route[j][1],
-                                        route[j + 1][0], route[j + 1][1])
+                score += next(seg_darkness)
             if score < best_score:
                 best_score = score
                 best = route
         return best
 
-    # --- Step 2 & 3 & 4: Place circles, route lines, draw ---
-    # Search directions: upper-left, up, upper-right, left, right,
-    #                    lower-left, down, lower-right
-    directions = [
-        (-1, -1), (0, -1), (1, -1),
-        (-1, 0), (1, 0),
-        (-1, 1), (0, 1), (1, 1),
-    ]
-    search_distances = [18, 28, 40, 55, 70, 90]
+    # Number label extents only depend on the string (same font throughout)
+    @lru_cache(maxsize=None)
+    def _number_bbox(num_str):
+        return draw.textbbox((0, 0), num_str, font=num_font)
 
+    # --- Step 2 & 3 & 4: Place circles, route lines, draw ---
     numbered_entries = []
 
-    # First pass: compute field pixel positions and place circles
-    placements = []  # list of (cx, cy, field_x, field_y, entry)
-    for idx, entry in enumerate(sorted_trans):
-        # Use center of field if bounding box available, otherwise use x0/y0
-        if "x1" in entry and "y1" in entry:
-            # OCR fields with bounding box - use center
-            field_y_pts = (entry.get("y0", 0) + entry.get("y1", 0)) / 2
-            field_x_pts = (entry.get("x0", 0) + entry.get("x1", 0)) / 2
-        else:
-            # Text-based fields - use x0/y0 (top-left)
-            field_y_pts = entry.get("y0", 0)
-            field_x_pts = entry.get("x0", 0)
-
-        field_y_px = field_y_pts * scale - crop_y_top_px + 4
-        field_x_px = field_x_pts * scale
-        # Clamp field position to image bounds
-        field_x_px = int(max(2, min(img_w - 2, field_x_px)))
-        field_y_px = int(max(2, min(img_h - 2, field_y_px)))
+    # First pass: compute field pixel positions (all fields at once) and place circles
+    # Use center of field if bounding box available (OCR fields), otherwise
+    # x0/y0 (top-left, text-based fields)
+    has_box = np.array([("x1" in e and "y1" in e) for e in sorted_trans], dtype=bool)
+    x0s = np.array([e.get("x0", 0) for e in sorted_trans], dtype=np.float64)
+    y0s = np.array([e.get("y0", 0) for e in sorted_trans], dtype=np.float64)
+    x1s = np.array([e.get("x1", 0) for e in sorted_trans], dtype=np.float64)
+    y1s = np.array([e.get("y1", 0) for e in sorted_trans], dtype=np.float64)
+    field_x_pts = np.where(has_box, (x0s + x1s) / 2, x0s)
+    field_y_pts = np.where(has_box, (y0s + y1s) / 2, y0s)
+    # Clamp field position to image bounds
+    field_xs = np.maximum(2, np.minimum(img_w - 2, field_x_pts * scale)).astype(np.int64).tolist()
+    field_ys = np.maximum(2, np.minimum(img_h - 2, field_y_pts * scale - crop_y_top_px + 4)).astype(np.int64).tolist()
 
+    placements = []  # list of (cx, cy, field_x, field_y, entry)
+    for entry, field_x_px, field_y_px in zip(sorted_trans, field_xs, field_ys):
         # Search outward for clear white space
         placed = False
-        for dist in search_distances:
-            if placed:
+        for (ddx, ddy) in _CIRCLE_SEARCH_OFFSETS:
+            cx = field_x_px + ddx
+            cy = field_y_px + ddy
+            if _circle_clear(cx, cy):
+                occupied_grid[(cx // min_dist, cy // min_dist)].append((cx, cy))
+                placements.append((cx, cy, field_x_px, field_y_px, entry))
+                placed = True
                 break
-            for (ddx, ddy) in directions:
-                cx = field_x_px + int(ddx * dist)
-                cy = field_y_px + int(ddy * dist)
-                if _circle_clear(cx, cy):
-                    occupied_circles.append((cx, cy))
-                    placements.append((cx, cy, field_x_px, field_y_px, entry))
-                    placed = True
-                    break
         if not placed:
             # Fallback: offset left of field
             cx = max(radius + 1, field_x_px - 40)
             cy = max(radius + 1, min(img_h - radius - 1, field_y_px))
-            occupied_circles.append((cx, cy))
+            occupied_grid[(cx // min_dist, cy // min_dist)].append((cx, cy))
             placements.append((cx, cy, field_x_px, field_y_px, entry))
 
-    # Second pass: draw in correct order (lines → dots → circles)
+    # Second pass: draw in correct order (lines → dots → circles).
+    # Circles far enough from their field get a routed leader line + anchor
+    # dot; decide and route once, then draw each layer from the list
+    leaders = [
+        (fx, fy, _best_route(cx, cy, fx, fy))
+        for (cx, cy, fx, fy, entry) in placements
+        if (cx - fx) ** 2 + (cy - fy) ** 2 >= leader_min_sq
+    ]
+
     # Draw all leader lines first
-    for idx, (cx, cy, fx, fy, entry) in enumerate(placements):
-        dist = math.hypot(cx - fx, cy - fy)
-        if dist >= radius + 5:
-            route = _best_route(cx, cy, fx, fy)
-            for j in range(len(route) - 1):
-                draw.line(
-                    [route[j], route[j + 1]],
-                    fill=(220, 50, 50, 90),
-                    width=1,
-                )
+    for fx, fy, route in leaders:
+        for j in range(len(route) - 1):
+            draw.line(
+                [route[j], route[j + 1]],
+                fill=(220, 50, 50, 90),
+                width=1,
+            )
 
     # Draw all field anchor dots
     dot_r = 3
-    for idx, (cx, cy, fx, fy, entry) in enumerate(placements):
-        dist = math.hypot(cx - fx, cy - fy)
-        if dist >= radius + 5:
-            draw.ellipse(
-                [fx - dot_r, fy - dot_r, fx + dot_r, fy + dot_r],
-                fill=(220, 50, 50, 160),
-            )
+    for fx, fy, route in leaders:
+        draw.ellipse(
+            [fx - dot_r, fy - dot_r, fx + dot_r, fy + dot_r],
+            fill=(220, 50, 50, 160),
+        )
 
     # Draw all circles and numbers on top
     for idx, (cx, cy, fx, fy, entry) in enumerate(placements):
@@ -1204,7 +1866,7 @@ def annotate_section_image(cropped_image, zone_translations, zone, page_height_p
         )
         # White number text centered in circle
         num_str = str(number)
-        bbox = draw.textbbox((0, 0), num_str, font=num_font)
+        bbox = _number_bbox(num_str)
         tw = bbox[2] - bbox[0]
         th = bbox[3] - bbox[1]
         draw.text(
@@ -1215,14 +1877,17 @@ def annotate_section_image(cropped_image, zone_translations, zone, page_height_p
         )
         numbered_entries.append((number, entry))
 
-    # Convert back to RGB for compatibility
-    annotated = annotated.convert("RGB")
     return annotated, numbered_entries
 
 
+@lru_cache(maxsize=256)
 def _compute_vision_cache_key(zone_name, field_texts):
-    """Deterministic cache key from zone name + sorted field texts."""
-    combined = zone_name + "|" + "|".join(sorted(field_texts))
+    """Deterministic cache key from zone name + field texts (a sorted tuple).
+
+    Stays MD5, like translation_cache_key(), so cached Vision explanations
+    (paid calls) keep matching.
+    """
+    combined = zone_name + "|" + "|".join(field_texts)
     digest = hashlib.md5(combined.encode("utf-8")).hexdigest()
     return f"_vision_explanations:{zone_name}:{digest}"
 
@@ -1242,18 +1907,12 @@ def vision_explain_fields(cropped_image, numbered_entries, zone_name):
         import anthropic
         import base64
     except ImportError:
-        print("  WARN: anthropic package not installed. Skipping vision explanations.")
+        logger.warning("  anthropic package not installed. Skipping vision explanations.")
         return {}
 
     if cropped_image is None:
         return {}
 
-    # Encode image as base64 PNG
-    import io as _io
-    img_buf = _io.BytesIO()
-    cropped_image.save(img_buf, format="PNG")
-    img_b64 = base64.b64encode(img_buf.getvalue()).decode("utf-8")
-
     # Build field list for prompt
     field_list = "\n".join(
         f"  {num}: {entry.get('ja', '')} ({entry.get('en', '')})"
@@ -1262,6 +1921,15 @@ def vision_explain_fields(cropped_image, numbered_entries, zone_name):
 
     try:
         client = anthropic.Anthropic(api_key=api_key)
+
+        # Encode image as base64 PNG only once the client is up — fast
+        # compression (it's a request payload, not stored), encoded straight
+        # from the buffer without a bytes copy
+        import io as _io
+        img_buf = _io.BytesIO()
+        cropped_image.save(img_buf, format="PNG", compress_level=1)
+        img_b64 = base64.b64encode(img_buf.getbuffer()).decode("ascii")
+
         message = client.messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=2000,
@@ -1304,15 +1972,15 @@ def vision_explain_fields(cropped_image, numbered_entries, zone_name):
                 lines = lines[:-1]
             raw = "\n".join(lines)
 
-        result = json.loads(raw)
+        result = loads_json(raw)
         # Normalize keys to int
         return {int(k): v for k, v in result.items()}
 
     except (json.JSONDecodeError, ValueError) as e:
-        print(f"  WARN: Could not parse vision response for zone '{zone_name}': {e}")
+        logger.warning("  Could not parse vision response for zone '%s': %s", zone_name, e)
         return {}
     except Exception as e:
-        print(f"  WARN: Vision explanation failed for zone '{zone_name}': {e}")
+        logger.warning("  Vision explanation failed for zone '%s': %s", zone_name, e)
         return {}
 
 
@@ -1348,6 +2016,7 @@ def resolve_explanations(numbered_entries, zone_name, dictionary, cache,
     """
     results = []
     need_vision = []
+    kanji_tips, label_tips = _get_indexes(dictionary)[3]
 
     for number, entry in numbered_entries:
         explanation = ""
@@ -1364,35 +2033,15 @@ def resolve_explanations(numbered_entries, zone_name, dictionary, cache,
                 if tip:
                     explanation = tip
             if not explanation:
-                # Search by kanji match
-                for fid, fdata in dictionary.items():
-                    if ja_text == fdata.get("kanji", ""):
-                        tip = fdata.get("tip_en", "")
-                        if tip:
-                            explanation = tip
-                        break
-                    for alias in fdata.get("aliases", []):
-                        if ja_text == alias:
-                            tip = fdata.get("tip_en", "")
-                            if tip:
-                                explanation = tip
-                            break
-                    if explanation:
-                        break
+                # Search by kanji / alias match
+                explanation = label_tips.get(ja_text, "")
 
         # 2. Fragment path — look up the matched kanji fragments
         if not explanation and trans_type == "fragment" and note:
             # note format: "Matched: 住所, 方書" — look up each kanji
             if note.startswith("Matched:"):
                 kanji_parts = [k.strip() for k in note.split(":", 1)[1].split(",")]
-                tips = []
-                for kanji in kanji_parts:
-                    for fid, fdata in dictionary.items():
-                        if kanji == fdata.get("kanji", ""):
-                            tip = fdata.get("tip_en", "")
-                            if tip:
-                                tips.append(tip)
-                            break
+                tips = [kanji_tips[kanji] for kanji in kanji_parts if kanji_tips.get(kanji)]
                 if tips:
                     explanation = " ".join(tips[:2])
 
@@ -1410,13 +2059,13 @@ def resolve_explanations(numbered_entries, zone_name, dictionary, cache,
     if need_vision and use_llm and annotated_image is not None:
         # Check cache first
         field_texts = [e.get("ja", "") for _, e in need_vision]
-        cache_key = _compute_vision_cache_key(zone_name, field_texts)
+        cache_key = _compute_vision_cache_key(zone_name, tuple(sorted(field_texts)))
 
         vision_results = None
         if cache and cache_key in cache:
             vision_results = cache[cache_key]
         else:
-            print(f"    Vision explaining {len(need_vision)} fields in '{zone_name}'...")
+            logger.info("    Vision explaining %d fields in '%s'...", len(need_vision), zone_name)
             vision_results = vision_explain_fields(annotated_image, need_vision, zone_name)
             if cache is not None and vision_results:
                 cache[cache_key] = vision_results
@@ -1465,17 +2114,139 @@ def _split_zone_into_chunks(zone, zone_translations, max_fields=15):
         # Split into chunks of max_fields
         for i in range(0, len(sorted_trans), max_fields):
             chunk_trans = sorted_trans[i:i + max_fields]
-            # Derive sub-zone y bounds from field positions (with padding)
-            y_positions = [t.get("y0", 0) for t in chunk_trans]
+            # Derive sub-zone y bounds from field positions (with padding);
+            # the chunk is sorted by y0, so its first/last fields are the extremes
             padding = 5
             sub_zone = dict(zone)  # shallow copy
-            sub_zone["y_min"] = max(0, min(y_positions) - padding)
-            sub_zone["y_max"] = max(y_positions) + padding
+            sub_zone["y_min"] = max(0, chunk_trans[0].get("y0", 0) - padding)
+            sub_zone["y_max"] = chunk_trans[-1].get("y0", 0) + padding
             chunks.append((sub_zone, chunk_trans))
 
     return chunks
 
 
+# Any character from U+3000 (CJK punctuation) up needs the Japanese font
+_NEEDS_JA_FONT_RE = re.compile("[\u3000-\U0010ffff]")
+
+
+def _needs_ja_font(text):
+    """True if text has a character from U+3000 up. Plain-ASCII strings (most
+    English labels) are answered by str.isascii() without a regex scan."""
+    return not text.isascii() and _NEEDS_JA_FONT_RE.search(text) is not None
+
+
+@lru_cache(maxsize=8192)
+def _string_width(text, font_name, size):
+    """Memoised pdfmetrics.stringWidth — labels, headings and wrapped words
+    recur across zones and pages, in a handful of fonts and sizes."""
+    from reportlab.pdfbase import pdfmetrics
+
+    return pdfmetrics.stringWidth(text, font_name, size)
+
+
+@lru_cache(maxsize=1024)
+def _fitted_font_size(text, font_name, max_size, min_size, max_width):
+    """
+    Largest font size (max_size, max_size - 0.5, ... down to min_size) at
+    which text fits in max_width; one step below min_size if none fit.
+
+    Width grows with size, so the step is found by binary search, and the
+    result is memoised (headers repeat the same text on every page).
+    """
+    sizes = []
+    size = max_size
+    while size >= min_size:
+        sizes.append(size)
+        size -= 0.5
+    lo, hi = 0, len(sizes)  # first index that fits, or len(sizes) if none do
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _string_width(text, font_name, sizes[mid]) <= max_width:
+            hi = mid
+        else:
+            lo = mid + 1
+    return sizes[lo] if lo < len(sizes) else size
+
+
+@lru_cache(maxsize=4096)
+def _wrap_text(text, font_name, font_size, max_width):
+    """
+    Split text into lines that fit within max_width. Returns a tuple; results
+    are memoised, as bank rows, document lists and tips repeat the same
+    strings at the same widths.
+
+    Each word is measured once, and the break after each line is found by
+    bisecting prefix sums of word-plus-space widths — words start..end-1 fit
+    when prefix[end] - prefix[start] - space_w <= max_width — so the per-line
+    work is a C-level search rather than a Python loop over every word. Words
+    wider than max_width are first split between characters, so no line
+    runs past it.
+    """
+    words = text.split()
+    if not words:
+        return ("",)
+    # Most labels fit on one line: one measurement, no per-word widths
+    line = " ".join(words)
+    if _string_width(line, font_name, font_size) <= max_width:
+        return (line,)
+    space_w = _string_width(" ", font_name, font_size)
+    widths = [_string_width(word, font_name, font_size) for word in words]
+    if max(widths) > max_width:
+        words, widths = _break_wide_words(words, widths, font_name, font_size, max_width)
+    prefix = [0.0]
+    prefix.extend(accumulate(width + space_w for width in widths))
+    lines = []
+    start = 0
+    while start < len(words):
+        end = max(bisect_right(prefix, prefix[start] + max_width + space_w, start + 1) - 1, start + 1)
+        lines.append(" ".join(words[start:end]))
+        start = end
+    return tuple(lines)
+
+def _break_wide_words(words, widths, font_name, font_size, max_width):
+    """
+    Split words wider than max_width (unspaced Japanese, long URLs) between
+    characters. Returns (words, widths) with each such word replaced by
+    pieces that fit, found by bisecting the word's character prefix widths
+    the same way _wrap_text bisects word prefixes.
+    """
+    out_words = []
+    out_widths = []
+    for word, width in zip(words, widths):
+        if width <= max_width:
+            out_words.append(word)
+            out_widths.append(width)
+            continue
+        prefix = [0.0]
+        prefix.extend(accumulate(_string_width(ch, font_name, font_size) for ch in word))
+        start = 0
+        while start < len(word):
+            end = max(bisect_right(prefix, prefix[start] + max_width, start + 1) - 1, start + 1)
+            out_words.append(word[start:end])
+            out_widths.append(prefix[end] - prefix[start])
+            start = end
+    return out_words, out_widths
+
+
+
+def _draw_text_runs(c, text_runs):
+    """
+    Draw queued text grouped by state: text_runs maps (fill, font, size) to
+    [(x, y, text, centred)]. Each group is one text object — a single BT/ET
+    block that moves the origin between strings — rather than one per string.
+    """
+    for (fill, font_name, size), runs in text_runs.items():
+        c.setFillColor(fill)
+        c.setFont(font_name, size)
+        t = c.beginText()
+        for x, y, text, centred in runs:
+            if centred:
+                x -= _string_width(text, font_name, size) / 2
+            t.setTextOrigin(x, y)
+            t.textOut(text)
+        c.drawText(t)
+
+
 def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
                    page_image=None, page_images=None, page_height_pts=842,
                    page_heights=None, zones=None, dictionary=None, cache=None,
@@ -1490,14 +2261,15 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
     M+1. Counter phrases
 
     Args:
-        page_images: List of (page_num, PIL.Image) tuples for all source pages
+        page_images: List of (page_num, image) tuples for all source pages, where
+            image is a PIL.Image or the path of a cached page render (decoded
+            on demand)
         page_heights: List of page heights in points for each source page
     """
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.colors import HexColor
     from reportlab.pdfgen import canvas
     from reportlab.lib.utils import ImageReader
-    from reportlab.pdfbase import pdfmetrics
     import io
 
     has_font = register_fonts()
@@ -1516,22 +2288,19 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
     WHITE = HexColor("#ffffff")
     WARM_BG = HexColor("#fff3e0")
     LGRAY = HexColor("#f2f3f4")
+    DARK_GRAY = HexColor("#444444")
+    BORDER_GRAY = HexColor("#cccccc")
 
     def pick_font(text, size, prefer_en=True):
         """Set canvas font, auto-switching to Japanese font if text contains CJK."""
-        if any(ord(ch) >= 0x3000 for ch in text):
+        if _needs_ja_font(text):
             c.setFont(font_ja, size)
         else:
             c.setFont(font_en if prefer_en else font_ja, size)
 
     def draw_fitted_string(x, y, text, font_name, max_size, min_size, max_width):
         """Draw text, shrinking font size if needed to fit within max_width."""
-        size = max_size
-        while size >= min_size:
-            w = pdfmetrics.stringWidth(text, font_name, size)
-            if w <= max_width:
-                break
-            size -= 0.5
+        size = _fitted_font_size(text, font_name, max_size, min_size, max_width)
         c.setFont(font_name, size)
         c.drawString(x, y, text)
 
@@ -1542,17 +2311,18 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
         form_name_en = form_template.get("names", {}).get("en", form_name_en)
         form_name_ja = form_template.get("names", {}).get("ja", form_name_ja)
 
-    # Count total pages (account for dense zone splitting into chunks)
-    section_count = 0
-    for z in zones:
-        zt = translations_by_zone.get(z["name"], [])
-        if zt:
-            section_count += len(_split_zone_into_chunks(z, zt))
+    # Count total pages (account for dense zone splitting into chunks); the
+    # chunks are kept for the section pages below rather than split again
+    zone_chunks = [
+        _split_zone_into_chunks(z, translations_by_zone[z["name"]]) if translations_by_zone.get(z["name"]) else []
+        for z in zones
+    ]
+    section_count = sum(len(chunks) for chunks in zone_chunks)
     total_pages = 2 + section_count + 1  # original + cover + sections + phrases
     if not form_template:
         total_pages = 2 + section_count  # no cover/phrases without template
 
-    c = canvas.Canvas(str(output_path), pagesize=A4)
+    c = canvas.Canvas(str(output_path), pagesize=A4, pageCompression=1)
     ward_label = ward_name.replace("-", " ").title() if ward_name else ""
     title_prefix = f"{ward_label} — " if ward_label else ""
     c.setTitle(f"{title_prefix}{form_name_en} ({form_name_ja}) — Bilingual Guide")
@@ -1563,17 +2333,23 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
     def next_page():
         current_page[0] += 1
 
+    # Header/footer text and colours are fixed for the document
+    header_text = f"{form_name_ja}  {form_name_en}"
+    if ward_label:
+        header_text = f"{ward_label}  —  {header_text}"
+    header_sub_color = HexColor("#aabbcc")
+    footer_color = HexColor("#bdc3c7")
+    footer_text = (f"Generated {date.today().isoformat()} from github.com/wkesner/japan-forms"
+                   "  |  Not an official government document")
+
     def draw_header():
         c.setFillColor(NAVY)
         c.rect(0, HEIGHT - 40, WIDTH, 40, fill=True, stroke=False)
         c.setFillColor(WHITE)
-        header_text = f"{form_name_ja}  {form_name_en}"
-        if ward_label:
-            header_text = f"{ward_label}  —  {header_text}"
         draw_fitted_string(15, HEIGHT - 27, header_text, font_ja, 12, 7, WIDTH - 30)
         c.setFont(font_en, 7)
-        c.setFillColor(HexColor("#aabbcc"))
-        c.drawString(15, HEIGHT - 37, f"japan-forms  ·  Bilingual Guide")
+        c.setFillColor(header_sub_color)
+        c.drawString(15, HEIGHT - 37, "japan-forms  ·  Bilingual Guide")
         c.drawRightString(WIDTH - 15, HEIGHT - 37, f"Page {current_page[0]}/{total_pages}")
         c.setStrokeColor(RED)
         c.setLineWidth(2)
@@ -1581,16 +2357,19 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
 
     def draw_footer():
         c.setFont(font_en, 5.5)
-        c.setFillColor(HexColor("#bdc3c7"))
-        c.drawString(15, 10,
-            f"Generated {date.today().isoformat()} from github.com/wkesner/japan-forms  |  Not an official government document")
+        c.setFillColor(footer_color)
+        c.drawString(15, 10, footer_text)
 
     # ═══ PAGES 1-N: Original Form (all pages embedded) ═══
     # Use page_images if available, fall back to single page_image
     images_to_embed = page_images if page_images else ([(0, page_image)] if page_image else [])
 
+    def as_image(img):
+        return _load_page_image(img) if isinstance(img, (str, Path)) else img
+
     if images_to_embed:
         for page_idx, (src_page_num, img) in enumerate(images_to_embed):
+            img = as_image(img)
             if page_idx > 0:
                 c.showPage()
             next_page()
@@ -1598,11 +2377,6 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
             draw_footer()
 
             try:
-                img_buf = io.BytesIO()
-                img.save(img_buf, format="PNG")
-                img_buf.seek(0)
-                img_reader = ImageReader(img_buf)
-
                 # Scale to fit within margins
                 avail_w = WIDTH - 2 * margin
                 avail_h = HEIGHT - 80  # header + footer
@@ -1613,6 +2387,17 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
                 x = (WIDTH - draw_w) / 2
                 y = 25  # above footer
 
+                # The full-page overview only needs PAGE_EMBED_DPI at its drawn
+                # size; zone crops below still use the full-resolution render
+                target_w = int(draw_w / 72 * PAGE_EMBED_DPI)
+                if target_w < img_w:
+                    from PIL import Image
+                    img = img.resize((target_w, max(1, round(img_h * target_w / img_w))), Image.LANCZOS)
+
+                # ImageReader takes the PIL image as-is and compresses the
+                # pixels itself — no PNG encode/decode round trip
+                img_reader = ImageReader(img)
+
                 c.drawImage(img_reader, x, y, width=draw_w, height=draw_h)
             except Exception as e:
                 c.setFont(font_en, 12)
@@ -1673,22 +2458,33 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
                 c.drawString(margin, y, f">> {scenario['title_en']}")
                 y -= 14
 
+                # Lay out the rows first, then draw column by column so the
+                # font / colour operators are only emitted when they change
+                doc_rows = []
                 for doc in scenario.get("documents_required", []):
                     if y < 60:
                         break
+                    doc_rows.append((y, doc))
+                    y -= 12
+
+                fill = None
+                for row_y, doc in doc_rows:
                     marker = "* " if doc["required"] else "  "
-                    c.setFillColor(NAVY if doc["required"] else GRAY)
+                    if (NAVY if doc["required"] else GRAY) is not fill:
+                        fill = NAVY if doc["required"] else GRAY
+                        c.setFillColor(fill)
                     line = f"{marker}{doc['en']}"
                     cond = doc.get("condition_en", "")
                     if cond:
                         line += f"  ({cond})"
                     pick_font(line, 7.5)
-                    c.drawString(margin + 10, y, line)
+                    c.drawString(margin + 10, row_y, line)
 
+                if doc_rows:
                     c.setFont(font_ja, 7)
                     c.setFillColor(GRAY)
-                    c.drawString(margin + 300, y, doc["ja"])
-                    y -= 12
+                    for row_y, doc in doc_rows:
+                        c.drawString(margin + 300, row_y, doc["ja"])
                 y -= 6
 
         # ── Common Mistakes ──
@@ -1704,19 +2500,25 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
             c.line(margin, y, margin + 140, y)
             y -= 15
 
+            # Mistake lines (red) then fix lines (gray), one colour change each
+            mistake_rows = []
             for m in mistakes[:4]:
                 if y < 80:
                     break
-                mistake_text = f"X  {m['mistake_en']}"
-                pick_font(mistake_text, 7.5)
+                mistake_rows.append((y, m))
+                y -= 25
+
+            if mistake_rows:
                 c.setFillColor(RED)
-                c.drawString(margin, y, mistake_text)
-                y -= 11
-                fix_text = f"-> {m['fix_en']}"
-                pick_font(fix_text, 7.5)
+                for row_y, m in mistake_rows:
+                    mistake_text = f"X  {m['mistake_en']}"
+                    pick_font(mistake_text, 7.5)
+                    c.drawString(margin, row_y, mistake_text)
                 c.setFillColor(GRAY)
-                c.drawString(margin + 15, y, fix_text)
-                y -= 14
+                for row_y, m in mistake_rows:
+                    fix_text = f"-> {m['fix_en']}"
+                    pick_font(fix_text, 7.5)
+                    c.drawString(margin + 15, row_y - 11, fix_text)
 
         # ── After Submission ──
         after = form_template.get("after_submission", [])
@@ -1744,7 +2546,17 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
     if dictionary is None:
         dictionary = {}
 
-    for zone in zones:
+    import numpy as np
+    # Per-page derived data, keyed by source page (None for a lone page_image):
+    # image objects for path entries can be evicted and re-decoded, so id()
+    # is not a stable key
+    page_grays = {}  # page -> full-page grayscale ndarray for annotate_section_image
+    page_thumbs = {}  # page -> mini-map ImageReader, shared by every zone on that page
+    page_image_map = {}  # page number -> page image (first entry wins)
+    for pg_num, pg_img in page_images or ():
+        page_image_map.setdefault(pg_num, pg_img)
+
+    for zone, split_chunks in zip(zones, zone_chunks):
         zone_name = zone["name"]
         zone_translations = translations_by_zone.get(zone_name, [])
         if not zone_translations:
@@ -1754,7 +2566,7 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
         if zone_name == "Staff Section":
             chunks = [(zone, zone_translations)]
         else:
-            chunks = _split_zone_into_chunks(zone, zone_translations)
+            chunks = split_chunks
         num_chunks = len(chunks)
 
         for chunk_idx, (chunk_zone, chunk_translations) in enumerate(chunks):
@@ -1783,7 +2595,7 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
             cropped = None
             annotated_img = None
             numbered_entries = []
-            img_bytes = None
+            img_reader = None
             draw_w = draw_h = 0
 
             # Find the source page for this chunk's translations
@@ -1793,29 +2605,33 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
             # Select the appropriate page image
             selected_image = None
             selected_height = page_height_pts
+            page_key = None
             if page_images:
-                for pg_num, pg_img in page_images:
-                    if pg_num == source_page:
-                        selected_image = pg_img
-                        if page_heights and source_page < len(page_heights):
-                            selected_height = page_heights[source_page]
-                        break
+                page_key = source_page
+                selected_image = as_image(page_image_map.get(source_page))
+                if selected_image is not None and page_heights and source_page < len(page_heights):
+                    selected_height = page_heights[source_page]
             elif page_image:
-                selected_image = page_image
+                selected_image = as_image(page_image)
 
             if selected_image:
                 cropped = crop_section(selected_image, chunk_zone, selected_height, selected_image.height)
 
             if cropped:
+                # One grayscale conversion per page image, sliced by every zone on it
+                if page_key not in page_grays:
+                    page_grays[page_key] = np.asarray(selected_image.convert("L"))
                 annotated_img, numbered_entries = annotate_section_image(
-                    cropped, chunk_translations, chunk_zone, selected_height, selected_image.height
+                    cropped, chunk_translations, chunk_zone, selected_height, selected_image.height,
+                    page_gray=page_grays[page_key],
                 )
                 display_img = annotated_img if annotated_img else cropped
 
                 img_buf = io.BytesIO()
-                display_img.save(img_buf, format="PNG")
-                img_bytes = img_buf.getvalue()  # save bytes for continuation pages
-                img_reader = ImageReader(io.BytesIO(img_bytes))
+                display_img.convert("RGB").save(img_buf, format="JPEG", quality=EMBED_JPEG_QUALITY)
+                # One reader per crop, reused on continuation pages: drawImage
+                # decodes and hashes the pixels once per reader, not per draw
+                img_reader = ImageReader(io.BytesIO(img_buf.getvalue()))
 
                 # Scale annotated image to fit page width
                 avail_w = WIDTH - 2 * margin
@@ -1831,7 +2647,7 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
                 c.drawImage(img_reader, margin, y - draw_h, width=draw_w, height=draw_h)
 
                 # Border
-                c.setStrokeColor(HexColor("#cccccc"))
+                c.setStrokeColor(BORDER_GRAY)
                 c.setLineWidth(0.5)
                 c.rect(margin - 2, y - draw_h - 4, draw_w + 4, draw_h + 4, fill=False, stroke=True)
 
@@ -1845,14 +2661,15 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
                     mini_x = WIDTH - margin - mini_w
                     mini_y = 25  # above footer
 
-                    # Draw thumbnail
-                    thumb = selected_image.copy()
-                    thumb.thumbnail((int(mini_w * 2), int(mini_h * 2)))  # 2x for quality
-                    thumb_buf = io.BytesIO()
-                    thumb.save(thumb_buf, format="PNG")
-                    thumb_buf.seek(0)
-                    thumb_reader = ImageReader(thumb_buf)
-                    c.drawImage(thumb_reader, mini_x, mini_y, width=mini_w, height=mini_h)
+                    # Draw thumbnail (2x for quality); box-filter downsampling
+                    # is plenty at this size and much cheaper than Lanczos
+                    if page_key not in page_thumbs:
+                        from PIL import Image
+                        thumb = selected_image.resize((max(1, int(mini_w * 2)), mini_h * 2), Image.BOX)
+                        thumb_buf = io.BytesIO()
+                        thumb.convert("RGB").save(thumb_buf, format="JPEG", quality=EMBED_JPEG_QUALITY)
+                        page_thumbs[page_key] = ImageReader(io.BytesIO(thumb_buf.getvalue()))
+                    c.drawImage(page_thumbs[page_key], mini_x, mini_y, width=mini_w, height=mini_h)
 
                     # Draw rectangle showing cropped region
                     crop_scale = mini_h / selected_image.height
@@ -1901,6 +2718,23 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
             avail_w = WIDTH - 2 * margin
             circle_r = 8
             line_spacing = 7  # extra spacing between entries
+            cx = margin + circle_r + 2
+            text_x = margin + circle_r * 2 + 12
+
+            # Entries are laid out first and drawn per page, grouped by fill
+            # colour and font, so each page sets RED/WHITE/NAVY/GRAY once
+            # instead of once per entry
+            circle_centres = []
+            text_runs = defaultdict(list)  # (fill, font, size) -> [(x, y, text, centred)]
+
+            def flush_entries():
+                if circle_centres:
+                    c.setFillColor(RED)
+                    for ccx, ccy in circle_centres:
+                        c.circle(ccx, ccy, circle_r, fill=True, stroke=False)
+                _draw_text_runs(c, text_runs)
+                circle_centres.clear()
+                text_runs.clear()
 
             for exp_idx, (number, entry, explanation) in enumerate(explanations):
                 ja_text = entry.get("ja", "")
@@ -1909,28 +2743,19 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
                 en_text = en_text.replace("\u3000", " ")
 
                 # Pre-compute whether English wraps to next line
-                text_x = margin + circle_r * 2 + 12
-                ja_w = pdfmetrics.stringWidth(ja_text, font_ja, 9)
-                en_w = pdfmetrics.stringWidth(en_text, font_en, 8)
-                en_on_next_line = (text_x + ja_w + 15 + en_w) > (WIDTH - margin)
+                ja_w = _string_width(ja_text, font_ja, 9)
+                en_x = text_x + ja_w + 15
+                en_on_next_line = en_x + _string_width(en_text, font_en, 8) > WIDTH - margin
 
                 # Calculate space needed for this entry
                 # Header line (~16pt, or +12 if en wraps) + explanation wrap lines (~11pt each)
                 explanation_lines = []
-                if explanation:
-                    # Word-wrap explanation to ~80 chars
-                    words = explanation.split()
-                    line_buf = ""
-                    for word in words:
-                        test = f"{line_buf} {word}".strip()
-                        if len(test) > 80:
-                            if line_buf:
-                                explanation_lines.append(line_buf)
-                            line_buf = word
-                        else:
-                            line_buf = test
-                    if line_buf:
-                        explanation_lines.append(line_buf)
+                exp_font = font_en
+                if explanation and explanation.strip():
+                    # Word-wrap explanation by measured width at the 7.5pt
+                    # draw size, in font_ja if any of it needs that font
+                    exp_font = font_ja if _needs_ja_font(explanation) else font_en
+                    explanation_lines = _wrap_text(explanation, exp_font, 7.5, WIDTH - margin - text_x)
 
                 entry_height = 16 + len(explanation_lines) * 11 + line_spacing
                 if en_on_next_line:
@@ -1942,6 +2767,7 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
                 entries_remaining = len(explanations) - exp_idx - 1
                 bottom_margin = 15 if entries_remaining <= 2 else 45
                 if y - entry_height < bottom_margin:
+                    flush_entries()
                     c.showPage()
                     next_page()
                     draw_header()
@@ -1959,58 +2785,44 @@ def generate_guide(pdf_path, translations_by_zone, form_template, output_path,
                     y -= 10
 
                     # Redraw crop image so numbered circles are visible
-                    if img_bytes and draw_w and draw_h:
-                        cont_reader = ImageReader(io.BytesIO(img_bytes))
+                    if img_reader and draw_w and draw_h:
                         c.setFillColor(LGRAY)
                         c.rect(margin - 2, y - draw_h - 4, draw_w + 4, draw_h + 4, fill=True, stroke=False)
-                        c.drawImage(cont_reader, margin, y - draw_h, width=draw_w, height=draw_h)
-                        c.setStrokeColor(HexColor("#cccccc"))
+                        c.drawImage(img_reader, margin, y - draw_h, width=draw_w, height=draw_h)
+                        c.setStrokeColor(BORDER_GRAY)
                         c.setLineWidth(0.5)
                         c.rect(margin - 2, y - draw_h - 4, draw_w + 4, draw_h + 4, fill=False, stroke=True)
                         y -= draw_h + 20
 
-                # Draw red circle with number
-                cx = margin + circle_r + 2
+                # Red circle with number
                 cy = y - circle_r
-                c.setFillColor(RED)
-                c.circle(cx, cy, circle_r, fill=True, stroke=False)
-                c.setFillColor(WHITE)
-                c.setFont(font_en, 8)
-                num_str = str(number)
-                c.drawCentredString(cx, cy - 3, num_str)
+                circle_centres.append((cx, cy))
+                text_runs[WHITE, font_en, 8].append((cx, cy - 3, str(number), True))
 
                 # Japanese + English on same line (or wrapped to next line)
-                text_x = margin + circle_r * 2 + 12
-                c.setFillColor(NAVY)
-                c.setFont(font_ja, 9)
-                c.drawString(text_x, y - 5, ja_text)
-
-                # Measure actual Japanese text width
-                ja_display_width = pdfmetrics.stringWidth(ja_text, font_ja, 9)
-                en_x = text_x + ja_display_width + 15
-                en_on_next_line = en_x + pdfmetrics.stringWidth(en_text, font_en, 8) > WIDTH - margin
-
-                c.setFillColor(GRAY)
-                pick_font(en_text, 8)
+                text_runs[NAVY, font_ja, 9].append((text_x, y - 5, ja_text, False))
+                en_font = font_ja if _needs_ja_font(en_text) else font_en
                 if en_on_next_line:
                     # English wraps to next line, indented at text_x
                     y -= 12
-                    c.drawString(text_x, y - 5, en_text)
+                    text_runs[GRAY, en_font, 8].append((text_x, y - 5, en_text, False))
                 else:
-                    c.drawString(en_x, y - 5, en_text)
+                    text_runs[GRAY, en_font, 8].append((en_x, y - 5, en_text, False))
 
                 y -= 16
 
-                # Explanation paragraph below
-                if explanation_lines:
-                    c.setFillColor(HexColor("#444444"))
-                    for exp_line in explanation_lines:
-                        pick_font(exp_line, 7.5)
-                        c.drawString(text_x, y - 2, exp_line)
-                        y -= 11
+                # Explanation paragraph below, each line in the font it needs
+                # (English lines of a paragraph quoting a Japanese term stay
+                # in font_en)
+                for exp_line in explanation_lines:
+                    exp_line_font = font_ja if _needs_ja_font(exp_line) else font_en
+                    text_runs[DARK_GRAY, exp_line_font, 7.5].append((text_x, y - 2, exp_line, False))
+                    y -= 11
 
                 y -= line_spacing
 
+            flush_entries()
+
     # ═══ LAST PAGE: Counter Phrases ═══
     if form_template:
         phrases = form_template.get("counter_phrases", [])
@@ -2108,7 +2920,6 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.colors import HexColor
     from reportlab.pdfgen import canvas
-    from reportlab.pdfbase import pdfmetrics
 
     has_font = register_fonts()
     font_ja = "JPFont" if has_font else "Helvetica"
@@ -2124,12 +2935,15 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
     LIGHT = HexColor("#ebf5fb")
     GREEN = HexColor("#27ae60")
     LGRAY = HexColor("#f2f3f4")
+    DARK_GRAY = HexColor("#444444")
+    RED_BG = HexColor("#fdecea")
+    RULE_GRAY = HexColor("#bdc3c7")
     margin = 28
 
     form_name_en = form_template.get("names", {}).get("en", "Form Guide")
     form_name_ja = form_template.get("names", {}).get("ja", "")
 
-    c = canvas.Canvas(str(output_path), pagesize=A4)
+    c = canvas.Canvas(str(output_path), pagesize=A4, pageCompression=1)
     c.setTitle(f"{form_name_en} ({form_name_ja}) — Walkthrough Guide")
     c.setAuthor("japan-forms")
 
@@ -2161,30 +2975,30 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         total_pages += 1
 
     def pick_font(text, size):
-        if any(ord(ch) >= 0x3000 for ch in text):
+        if _needs_ja_font(text):
             c.setFont(font_ja, size)
         else:
             c.setFont(font_en, size)
 
     def draw_fitted_string(x, y, text, font_name, max_size, min_size, max_width):
-        size = max_size
-        while size >= min_size:
-            w = pdfmetrics.stringWidth(text, font_name, size)
-            if w <= max_width:
-                break
-            size -= 0.5
+        size = _fitted_font_size(text, font_name, max_size, min_size, max_width)
         c.setFont(font_name, size)
         c.drawString(x, y, text)
 
+    # Header/footer text and colours are fixed for the document
+    header_text = f"{form_name_ja}  {form_name_en}"
+    header_sub_color = HexColor("#aabbcc")
+    footer_text = (f"Generated {date.today().isoformat()} from github.com/wkesner/japan-forms"
+                   "  |  Not an official document")
+
     def draw_header():
         current_page[0] += 1
         c.setFillColor(NAVY)
         c.rect(0, HEIGHT - 40, WIDTH, 40, fill=True, stroke=False)
         c.setFillColor(WHITE)
-        header_text = f"{form_name_ja}  {form_name_en}"
         draw_fitted_string(15, HEIGHT - 27, header_text, font_ja, 12, 7, WIDTH - 30)
         c.setFont(font_en, 7)
-        c.setFillColor(HexColor("#aabbcc"))
+        c.setFillColor(header_sub_color)
         c.drawString(15, HEIGHT - 37, "japan-forms  ·  Walkthrough Guide")
         c.drawRightString(WIDTH - 15, HEIGHT - 37, f"Page {current_page[0]}/{total_pages}")
         c.setStrokeColor(RED)
@@ -2193,9 +3007,8 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
 
     def draw_footer():
         c.setFont(font_en, 5.5)
-        c.setFillColor(HexColor("#bdc3c7"))
-        c.drawString(15, 10,
-            f"Generated {date.today().isoformat()} from github.com/wkesner/japan-forms  |  Not an official document")
+        c.setFillColor(RULE_GRAY)
+        c.drawString(15, 10, footer_text)
 
     def section_heading(y, title, underline_w=160):
         c.setFont(font_en, 13)
@@ -2207,28 +3020,28 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         c.line(margin, y, margin + underline_w, y)
         return y - 15
 
+    # List and table sections queue their text and draw it grouped by fill
+    # colour and font, so a page sets each state once instead of once per row.
+    # Queued text is drawn on top of anything drawn directly on the page.
+    text_runs = defaultdict(list)  # (fill, font, size) -> [(x, y, text, centred)]
+
+    def queue_text(fill, font_name, size, x, y, text, centred=False):
+        text_runs[fill, font_name, size].append((x, y, text, centred))
+
+    def flush_text():
+        _draw_text_runs(c, text_runs)
+        text_runs.clear()
+
+    def text_font(text):
+        """Font pick_font would choose for text."""
+        return font_ja if _needs_ja_font(text) else font_en
+
     def new_page():
+        flush_text()
         c.showPage()
         draw_header()
         draw_footer()
 
-    def wrap_text(text, font_name, font_size, max_width):
-        """Split text into lines that fit within max_width."""
-        words = text.split()
-        lines = []
-        current = ""
-        for word in words:
-            test = f"{current} {word}".strip()
-            if pdfmetrics.stringWidth(test, font_name, font_size) <= max_width:
-                current = test
-            else:
-                if current:
-                    lines.append(current)
-                current = word
-        if current:
-            lines.append(current)
-        return lines or [""]
-
     # ═══ PAGE 1: Cover Page ═══
     draw_header()
     draw_footer()
@@ -2256,11 +3069,11 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
 
         # Pre-compute all lines to size the box dynamically
         law_en = legal.get("law_en", "")
-        law_lines = wrap_text(law_en, font_en, 7, max_text_w) if law_en else []
+        law_lines = _wrap_text(law_en, font_en, 7, max_text_w) if law_en else []
         deadline = legal.get("deadline_description_en", "N/A")
-        deadline_lines = wrap_text(f"Deadline: {deadline}", font_en, 7, max_text_w)
+        deadline_lines = _wrap_text(f"Deadline: {deadline}", font_en, 7, max_text_w)
         cost_note = legal.get("cost_note_en", f"Cost: ¥{legal.get('cost', 0)}")
-        cost_lines = wrap_text(cost_note, font_en, 7, max_text_w)
+        cost_lines = _wrap_text(cost_note, font_en, 7, max_text_w)
 
         box_h = 16 + (len(law_lines) + len(deadline_lines) + len(cost_lines)) * 10 + 4
         c.setFillColor(LIGHT)
@@ -2301,7 +3114,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             text = elig.get(key, "")
             if text:
                 c.setFillColor(NAVY)
-                for line in wrap_text(text, font_en, 7.5, WIDTH - 2 * margin - 10):
+                for line in _wrap_text(text, font_en, 7.5, WIDTH - 2 * margin - 10):
                     pick_font(line, 7.5)
                     c.drawString(margin + 5, y, line)
                     y -= 11
@@ -2316,7 +3129,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             c.setFont(font_en, 6)
             c.drawString(margin + 5, y + 2, "\u2022")
             c.setFillColor(NAVY)
-            for line in wrap_text(req, font_en, 7.5, WIDTH - 2 * margin - 20):
+            for line in _wrap_text(req, font_en, 7.5, WIDTH - 2 * margin - 20):
                 pick_font(line, 7.5)
                 c.drawString(margin + 15, y, line)
                 y -= 11
@@ -2327,7 +3140,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             c.setFont(font_en, 6)
             c.drawString(margin + 5, y + 2, "\u25b6")
             c.setFillColor(GRAY)
-            for line in wrap_text(exc, font_en, 7, WIDTH - 2 * margin - 20):
+            for line in _wrap_text(exc, font_en, 7, WIDTH - 2 * margin - 20):
                 pick_font(line, 7)
                 c.drawString(margin + 15, y, line)
                 y -= 10
@@ -2338,12 +3151,12 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             warn_text = elig.get(warn_key, "")
             if warn_text and y > 60:
                 box_w = WIDTH - 2 * margin
-                warn_lines = wrap_text(warn_text, font_en, 7, box_w - 20)
+                warn_lines = _wrap_text(warn_text, font_en, 7, box_w - 20)
                 box_h = 10 + len(warn_lines) * 10
                 if y - box_h < 40:
                     new_page()
                     y = HEIGHT - 60
-                c.setFillColor(HexColor("#fdecea"))
+                c.setFillColor(RED_BG)
                 c.rect(margin, y - box_h, box_w, box_h, fill=True, stroke=False)
                 c.setStrokeColor(RED)
                 c.setLineWidth(2)
@@ -2364,9 +3177,9 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         if difficulty:
             # Red-accented warning box
             box_w = WIDTH - 2 * margin
-            diff_lines = wrap_text(difficulty, font_en, 7.5, box_w - 20)
+            diff_lines = _wrap_text(difficulty, font_en, 7.5, box_w - 20)
             box_h = 10 + len(diff_lines) * 11
-            c.setFillColor(HexColor("#fdecea"))
+            c.setFillColor(RED_BG)
             c.rect(margin, y - box_h, box_w, box_h, fill=True, stroke=False)
             c.setStrokeColor(RED)
             c.setLineWidth(2)
@@ -2388,7 +3201,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 c.setFont(font_en, 6)
                 c.drawString(margin + 5, y + 2, "\u2022")
                 c.setFillColor(GRAY)
-                for line in wrap_text(text, font_en, 7, WIDTH - 2 * margin - 20):
+                for line in _wrap_text(text, font_en, 7, WIDTH - 2 * margin - 20):
                     pick_font(line, 7)
                     c.drawString(margin + 15, y, line)
                     y -= 10
@@ -2414,9 +3227,9 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
 
             content_lines = []
             if who:
-                content_lines.extend(wrap_text(f"Who: {who}", font_en, 7, box_w - 20))
+                content_lines.extend(_wrap_text(f"Who: {who}", font_en, 7, box_w - 20))
             if lump_note:
-                content_lines.extend(wrap_text(lump_note, font_en, 7, box_w - 20))
+                content_lines.extend(_wrap_text(lump_note, font_en, 7, box_w - 20))
 
             box_h = 18 + len(content_lines) * 10
             c.setFillColor(LIGHT)
@@ -2430,7 +3243,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             c.setFillColor(NAVY)
             c.setFont(font_ja, 9)
             c.drawString(bx, by, ja_name)
-            ja_w = pdfmetrics.stringWidth(ja_name, font_ja, 9)
+            ja_w = _string_width(ja_name, font_ja, 9)
             c.setFillColor(BLUE)
             c.setFont(font_en, 8)
             c.drawString(bx + ja_w + 10, by, en_name)
@@ -2454,7 +3267,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             note_text = payment.get(note_key, "")
             if note_text:
                 c.setFillColor(GRAY)
-                for line in wrap_text(note_text, font_en, 7, WIDTH - 2 * margin - 10):
+                for line in _wrap_text(note_text, font_en, 7, WIDTH - 2 * margin - 10):
                     pick_font(line, 7)
                     c.drawString(margin + 5, y, line)
                     y -= 10
@@ -2468,9 +3281,9 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             cap_text = f"Maximum: {max_months} months"
             cap_lines = [cap_text]
             if max_note:
-                cap_lines.extend(wrap_text(max_note, font_en, 7, box_w - 20))
+                cap_lines.extend(_wrap_text(max_note, font_en, 7, box_w - 20))
             box_h = 8 + len(cap_lines) * 11
-            c.setFillColor(HexColor("#fdecea"))
+            c.setFillColor(RED_BG)
             c.rect(margin, y - box_h, box_w, box_h, fill=True, stroke=False)
             c.setStrokeColor(RED)
             c.setLineWidth(2)
@@ -2481,7 +3294,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             c.setFont(font_en, 8)
             c.drawString(bx, by, cap_lines[0])
             by -= 12
-            c.setFillColor(HexColor("#444444"))
+            c.setFillColor(DARK_GRAY)
             c.setFont(font_en, 7)
             for line in cap_lines[1:]:
                 c.drawString(bx, by, line)
@@ -2492,7 +3305,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         reform_note = payment.get("reform_note_en", "")
         if reform_note:
             c.setFillColor(BLUE)
-            for line in wrap_text(reform_note, font_en, 7, WIDTH - 2 * margin - 10):
+            for line in _wrap_text(reform_note, font_en, 7, WIDTH - 2 * margin - 10):
                 pick_font(line, 7)
                 c.drawString(margin + 5, y, line)
                 y -= 10
@@ -2519,7 +3332,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         info_h = 8
         for label, val in info_items:
             if val:
-                info_h += 12 + len(wrap_text(val, font_en, 6.5, box_w - 80)) * 9
+                info_h += 12 + len(_wrap_text(val, font_en, 6.5, box_w - 80)) * 9
         c.rect(margin, y - info_h, box_w, info_h, fill=True, stroke=False)
         c.setStrokeColor(BLUE)
         c.setLineWidth(2)
@@ -2533,7 +3346,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 c.drawString(bx, by, f"{label}:")
                 by -= 10
                 c.setFillColor(GRAY)
-                for line in wrap_text(val, font_en, 6.5, box_w - 20):
+                for line in _wrap_text(val, font_en, 6.5, box_w - 20):
                     pick_font(line, 6.5)
                     c.drawString(bx + 5, by, line)
                     by -= 9
@@ -2566,77 +3379,65 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             c.drawString(cols[i] + 3, y + 1, h)
         y -= 16
 
+        row_h = 26
+        row_w = WIDTH - 2 * margin
+        row_bg_page = None  # page the LGRAY fill was last set on
         for idx, bank in enumerate(banks):
             if y < 60:
                 new_page()
                 y = HEIGHT - 60
 
-            row_h = 26
-            # Alternating row background
+            # Alternating row background. Row text is queued, so nothing else
+            # touches the fill colour between rows: set LGRAY once per page
             if idx % 2 == 0:
-                c.setFillColor(LGRAY)
-                c.rect(margin, y - row_h + 10, WIDTH - 2 * margin, row_h, fill=True, stroke=False)
+                if row_bg_page != current_page[0]:
+                    c.setFillColor(LGRAY)
+                    row_bg_page = current_page[0]
+                c.rect(margin, y - row_h + 10, row_w, row_h, fill=True, stroke=False)
 
             # Bank name (ja + en)
-            c.setFillColor(NAVY)
-            c.setFont(font_ja, 7)
-            c.drawString(cols[0] + 3, y + 2, bank["bank_ja"])
-            c.setFillColor(BLUE)
-            c.setFont(font_en, 6)
-            c.drawString(cols[0] + 3, y - 8, bank["bank_en"])
+            queue_text(NAVY, font_ja, 7, cols[0] + 3, y + 2, bank["bank_ja"])
+            queue_text(BLUE, font_en, 6, cols[0] + 3, y - 8, bank["bank_en"])
 
             # English support (wrap in narrow column)
-            c.setFillColor(GRAY)
-            c.setFont(font_en, 5.5)
-            support_lines = wrap_text(bank.get("english_support", ""), font_en, 5.5, 85)
+            support_lines = _wrap_text(bank.get("english_support", ""), font_en, 5.5, 85)
             for j, sl in enumerate(support_lines[:2]):
-                c.drawString(cols[1] + 3, y + 2 - j * 9, sl)
+                queue_text(GRAY, font_en, 5.5, cols[1] + 3, y + 2 - j * 9, sl)
 
             if is_corporate:
                 # Approval difficulty
                 diff = bank.get("approval_difficulty", "")
                 diff_color = RED if "High" in diff or "Very" in diff else NAVY
-                c.setFillColor(diff_color)
-                c.setFont(font_en, 7)
-                c.drawString(cols[2] + 3, y + 2, diff)
+                queue_text(diff_color, font_en, 7, cols[2] + 3, y + 2, diff)
 
                 # Screening time
-                c.setFillColor(NAVY)
-                c.setFont(font_en, 6.5)
-                c.drawString(cols[3] + 3, y + 2, bank.get("screening_time", ""))
+                queue_text(NAVY, font_en, 6.5, cols[3] + 3, y + 2, bank.get("screening_time", ""))
 
                 # Note (wrap)
-                c.setFillColor(GRAY)
-                c.setFont(font_en, 5.5)
-                note_lines = wrap_text(bank.get("note", ""), font_en, 5.5, WIDTH - cols[4] - margin - 5)
+                note_lines = _wrap_text(bank.get("note", ""), font_en, 5.5, WIDTH - cols[4] - margin - 5)
                 for j, nl in enumerate(note_lines[:3]):
-                    c.drawString(cols[4] + 3, y + 2 - j * 8, nl)
+                    queue_text(GRAY, font_en, 5.5, cols[4] + 3, y + 2 - j * 8, nl)
             else:
                 # Min residency
-                c.setFillColor(NAVY)
-                c.setFont(font_en, 7)
-                c.drawString(cols[2] + 3, y + 2, bank.get("min_residency", ""))
+                queue_text(NAVY, font_en, 7, cols[2] + 3, y + 2, bank.get("min_residency", ""))
 
                 # Hanko
                 hanko = bank.get("hanko_required", False)
-                c.setFillColor(RED if hanko else GREEN)
-                c.setFont(font_en, 7)
-                c.drawString(cols[3] + 3, y + 2, "Yes" if hanko else "No")
+                queue_text(RED if hanko else GREEN, font_en, 7, cols[3] + 3, y + 2, "Yes" if hanko else "No")
 
                 # Debit card
                 debit = bank.get("debit_card", False)
-                c.setFillColor(GREEN if debit else GRAY)
-                c.drawString(cols[4] + 3, y + 2, "Yes" if debit else "No")
+                queue_text(GREEN if debit else GRAY, font_en, 7, cols[4] + 3, y + 2, "Yes" if debit else "No")
 
                 # Best for
-                c.setFillColor(GRAY)
-                c.setFont(font_en, 5.5)
-                best_lines = wrap_text(bank.get("best_for", ""), font_en, 5.5, WIDTH - cols[5] - margin - 5)
+                best_lines = _wrap_text(bank.get("best_for", ""), font_en, 5.5, WIDTH - cols[5] - margin - 5)
                 for j, bl in enumerate(best_lines[:2]):
-                    c.drawString(cols[5] + 3, y + 2 - j * 9, bl)
+                    queue_text(GRAY, font_en, 5.5, cols[5] + 3, y + 2 - j * 9, bl)
 
             y -= row_h + 2
 
+        flush_text()
+
     # ═══ PAGE 3: What to Bring (Scenarios) ═══
     scenarios = form_template.get("scenarios", {})
     if scenarios:
@@ -2650,21 +3451,16 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 y = HEIGHT - 60
 
             # Scenario title
-            c.setFillColor(BLUE)
-            c.setFont(font_en, 10)
             title_line = f"{scenario['title_en']}"
-            c.drawString(margin, y, title_line)
-            c.setFillColor(GRAY)
-            c.setFont(font_ja, 7.5)
-            c.drawString(margin + pdfmetrics.stringWidth(title_line, font_en, 10) + 10, y + 1, scenario.get("title_ja", ""))
+            queue_text(BLUE, font_en, 10, margin, y, title_line)
+            queue_text(GRAY, font_ja, 7.5, margin + _string_width(title_line, font_en, 10) + 10, y + 1,
+                       scenario.get("title_ja", ""))
             y -= 14
 
             # Recommended bank
             rec = scenario.get("recommended_bank", "")
             if rec:
-                c.setFillColor(GREEN)
-                c.setFont(font_en, 7)
-                c.drawString(margin + 5, y, f"Recommended: {rec}")
+                queue_text(GREEN, font_en, 7, margin + 5, y, f"Recommended: {rec}")
                 y -= 14
 
             # Document list
@@ -2675,23 +3471,17 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
 
                 req = doc.get("required", False)
                 marker = "\u2713" if req else "\u25cb"
-                c.setFillColor(RED if req else GRAY)
-                c.setFont(font_ja, 7.5)
-                c.drawString(margin + 10, y, marker)
+                queue_text(RED if req else GRAY, font_ja, 7.5, margin + 10, y, marker)
 
-                c.setFillColor(NAVY if req else GRAY)
                 en_text = doc["en"]
                 cond = doc.get("condition_en", "")
                 if cond:
                     en_text += f"  ({cond})"
-                for line in wrap_text(en_text, font_en, 7.5, WIDTH - 2 * margin - 130):
-                    pick_font(line, 7.5)
-                    c.drawString(margin + 22, y, line)
+                for line in _wrap_text(en_text, font_en, 7.5, WIDTH - 2 * margin - 130):
+                    queue_text(NAVY if req else GRAY, text_font(line), 7.5, margin + 22, y, line)
                     y -= 10
 
-                c.setFillColor(GRAY)
-                c.setFont(font_ja, 7)
-                c.drawString(WIDTH - margin - 100, y + 10, doc.get("ja", ""))
+                queue_text(GRAY, font_ja, 7, WIDTH - margin - 100, y + 10, doc.get("ja", ""))
 
                 y -= 4
 
@@ -2702,9 +3492,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 if y < 80:
                     new_page()
                     y = HEIGHT - 60
-                c.setFillColor(BLUE)
-                c.setFont(font_en, 8)
-                c.drawString(margin + 10, y, "Additional Documents for This Scenario:")
+                queue_text(BLUE, font_en, 8, margin + 10, y, "Additional Documents for This Scenario:")
                 y -= 14
 
                 for doc in additional:
@@ -2714,28 +3502,24 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
 
                     req = doc.get("required", False)
                     marker = "\u2713" if req else "\u25cb"
-                    c.setFillColor(RED if req else GRAY)
-                    c.setFont(font_ja, 7.5)
-                    c.drawString(margin + 10, y, marker)
+                    queue_text(RED if req else GRAY, font_ja, 7.5, margin + 10, y, marker)
 
-                    c.setFillColor(NAVY if req else GRAY)
                     en_text = doc["en"]
                     cond = doc.get("condition_en", "")
                     if cond:
                         en_text += f"  ({cond})"
-                    for line in wrap_text(en_text, font_en, 7.5, WIDTH - 2 * margin - 130):
-                        pick_font(line, 7.5)
-                        c.drawString(margin + 22, y, line)
+                    for line in _wrap_text(en_text, font_en, 7.5, WIDTH - 2 * margin - 130):
+                        queue_text(NAVY if req else GRAY, text_font(line), 7.5, margin + 22, y, line)
                         y -= 10
 
-                    c.setFillColor(GRAY)
-                    c.setFont(font_ja, 7)
-                    c.drawString(WIDTH - margin - 100, y + 10, doc.get("ja", ""))
+                    queue_text(GRAY, font_ja, 7, WIDTH - margin - 100, y + 10, doc.get("ja", ""))
 
                     y -= 4
 
             y -= 12
 
+        flush_text()
+
     # ═══ Process Timeline Page ═══
     timeline = form_template.get("process_timeline", [])
     if timeline:
@@ -2759,36 +3543,28 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             cy = y + 3
             c.setFillColor(BLUE)
             c.circle(cx, cy, 10, fill=True, stroke=False)
-            c.setFillColor(WHITE)
-            c.setFont(font_en, 9)
-            c.drawCentredString(cx, cy - 3, str(step_num))
+            queue_text(WHITE, font_en, 9, cx, cy - 3, str(step_num), centred=True)
 
             # When label
-            c.setFillColor(BLUE)
-            c.setFont(font_en, 7)
-            c.drawString(margin + 25, y + 6, when)
+            queue_text(BLUE, font_en, 7, margin + 25, y + 6, when)
 
             # Title (en + ja)
-            c.setFillColor(NAVY)
-            c.setFont(font_en, 9)
-            c.drawString(margin + 25, y - 6, title_en)
-            c.setFillColor(GRAY)
-            c.setFont(font_ja, 7)
-            c.drawString(margin + 25 + pdfmetrics.stringWidth(title_en, font_en, 9) + 10, y - 5, title_ja)
+            queue_text(NAVY, font_en, 9, margin + 25, y - 6, title_en)
+            queue_text(GRAY, font_ja, 7, margin + 25 + _string_width(title_en, font_en, 9) + 10, y - 5, title_ja)
             y -= 20
 
             # Details (wrapped)
             if details:
-                c.setFillColor(HexColor("#444444"))
-                for line in wrap_text(details, font_en, 7, WIDTH - 2 * margin - 35):
+                for line in _wrap_text(details, font_en, 7, WIDTH - 2 * margin - 35):
                     if y < 50:
                         new_page()
                         y = HEIGHT - 60
-                    pick_font(line, 7)
-                    c.drawString(margin + 30, y, line)
+                    queue_text(DARK_GRAY, text_font(line), 7, margin + 30, y, line)
                     y -= 10
             y -= 10
 
+        flush_text()
+
     # ═══ PAGE 4+: Field-by-Field Translation ═══
     sections = form_template.get("sections", [])
     if sections:
@@ -2807,20 +3583,15 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             sec_title_ja = section.get("title_ja", "")
             c.setFillColor(NAVY)
             c.rect(margin, y - 2, WIDTH - 2 * margin, 16, fill=True, stroke=False)
-            c.setFillColor(WHITE)
-            c.setFont(font_en, 9)
-            c.drawString(margin + 5, y + 1, f"Section {sec_num}: {sec_title_en}")
-            c.setFont(font_ja, 8)
-            c.drawString(margin + 250, y + 1, sec_title_ja)
+            queue_text(WHITE, font_en, 9, margin + 5, y + 1, f"Section {sec_num}: {sec_title_en}")
+            queue_text(WHITE, font_ja, 8, margin + 250, y + 1, sec_title_ja)
             y -= 20
 
             # Section note
             sec_note = section.get("note_en", "")
             if sec_note:
-                c.setFillColor(BLUE)
-                for line in wrap_text(sec_note, font_en, 7, WIDTH - 2 * margin - 20):
-                    c.setFont(font_en, 7)
-                    c.drawString(margin + 10, y, line)
+                for line in _wrap_text(sec_note, font_en, 7, WIDTH - 2 * margin - 20):
+                    queue_text(BLUE, font_en, 7, margin + 10, y, line)
                     y -= 10
                 y -= 4
 
@@ -2844,50 +3615,36 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 # Field row
                 # Required marker
                 if required:
-                    c.setFillColor(RED)
-                    c.setFont(font_en, 6)
-                    c.drawString(margin + 2, y + 1, "REQ")
+                    queue_text(RED, font_en, 6, margin + 2, y + 1, "REQ")
                 else:
-                    c.setFillColor(GRAY)
-                    c.setFont(font_en, 6)
-                    c.drawString(margin + 2, y + 1, "OPT")
+                    queue_text(GRAY, font_en, 6, margin + 2, y + 1, "OPT")
 
                 # Kanji
-                c.setFillColor(NAVY)
-                c.setFont(font_ja, 10)
-                c.drawString(margin + 25, y, kanji)
-                kanji_w = pdfmetrics.stringWidth(kanji, font_ja, 10)
+                queue_text(NAVY, font_ja, 10, margin + 25, y, kanji)
+                kanji_w = _string_width(kanji, font_ja, 10)
 
                 # Romaji
-                c.setFillColor(GRAY)
-                pick_font(romaji_f, 7)
-                c.drawString(margin + 25 + kanji_w + 8, y + 1, romaji_f)
+                queue_text(GRAY, text_font(romaji_f), 7, margin + 25 + kanji_w + 8, y + 1, romaji_f)
 
                 # English + context label
-                c.setFillColor(BLUE)
-                c.setFont(font_en, 8)
                 en_display = english
                 if context_label:
                     en_display = f"{english} ({context_label})"
-                en_lines = wrap_text(en_display, font_en, 8, WIDTH - margin - 205)
+                en_lines = _wrap_text(en_display, font_en, 8, WIDTH - margin - 205)
                 for el in en_lines:
-                    c.drawString(margin + 200, y + 1, el)
+                    queue_text(BLUE, font_en, 8, margin + 200, y + 1, el)
                     y -= 13
 
                 # Tip
                 if tip:
-                    c.setFillColor(HexColor("#444444"))
-                    for line in wrap_text(tip, font_en, 6.5, WIDTH - 2 * margin - 40):
-                        c.setFont(font_en, 6.5)
-                        c.drawString(margin + 30, y, line)
+                    for line in _wrap_text(tip, font_en, 6.5, WIDTH - 2 * margin - 40):
+                        queue_text(DARK_GRAY, font_en, 6.5, margin + 30, y, line)
                         y -= 9
 
                 # Field-specific note from template
                 if field_note:
-                    c.setFillColor(GREEN)
-                    for line in wrap_text(f"\u25b6 {field_note}", font_en, 6.5, WIDTH - 2 * margin - 40):
-                        pick_font(line, 6.5)
-                        c.drawString(margin + 30, y, line)
+                    for line in _wrap_text(f"\u25b6 {field_note}", font_en, 6.5, WIDTH - 2 * margin - 40):
+                        queue_text(GREEN, text_font(line), 6.5, margin + 30, y, line)
                         y -= 9
 
                 # Options
@@ -2898,15 +3655,14 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                             new_page()
                             y = HEIGHT - 60
                         opt_en = opt_val.get("english", "")
-                        c.setFillColor(GRAY)
-                        c.setFont(font_ja, 6.5)
-                        c.drawString(margin + 35, y, f"{opt_key}")
-                        c.setFont(font_en, 6.5)
-                        c.drawString(margin + 100, y, f"= {opt_en}")
+                        queue_text(GRAY, font_ja, 6.5, margin + 35, y, f"{opt_key}")
+                        queue_text(GRAY, font_en, 6.5, margin + 100, y, f"= {opt_en}")
                         y -= 9
 
                 y -= 5
 
+        flush_text()
+
     # ═══ Common Mistakes Page ═══
     mistakes = form_template.get("common_mistakes", [])
     if mistakes:
@@ -2920,27 +3676,21 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 y = HEIGHT - 60
 
             # Mistake
-            c.setFillColor(RED)
-            c.setFont(font_en, 8)
-            c.drawString(margin, y, f"{i + 1}.")
-            c.setFillColor(NAVY)
-            for line in wrap_text(m["mistake_en"], font_en, 8, WIDTH - 2 * margin - 20):
-                c.setFont(font_en, 8)
-                c.drawString(margin + 15, y, line)
+            queue_text(RED, font_en, 8, margin, y, f"{i + 1}.")
+            for line in _wrap_text(m["mistake_en"], font_en, 8, WIDTH - 2 * margin - 20):
+                queue_text(NAVY, font_en, 8, margin + 15, y, line)
                 y -= 11
             y -= 2
 
             # Fix
-            c.setFillColor(GREEN)
-            c.setFont(font_en, 6)
-            c.drawString(margin + 15, y + 2, "\u25b6")
-            c.setFillColor(HexColor("#444444"))
-            for line in wrap_text(m["fix_en"], font_en, 7, WIDTH - 2 * margin - 30):
-                pick_font(line, 7)
-                c.drawString(margin + 25, y, line)
+            queue_text(GREEN, font_en, 6, margin + 15, y + 2, "\u25b6")
+            for line in _wrap_text(m["fix_en"], font_en, 7, WIDTH - 2 * margin - 30):
+                queue_text(DARK_GRAY, text_font(line), 7, margin + 25, y, line)
                 y -= 10
             y -= 10
 
+        flush_text()
+
     # ═══ Totalization Countries Page ═══
     totalization = form_template.get("totalization_countries", {})
     if totalization:
@@ -2952,9 +3702,9 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         explanation = totalization.get("explanation_en", "")
         if explanation:
             box_w = WIDTH - 2 * margin
-            exp_lines = wrap_text(explanation, font_en, 7.5, box_w - 20)
+            exp_lines = _wrap_text(explanation, font_en, 7.5, box_w - 20)
             box_h = 10 + len(exp_lines) * 11
-            c.setFillColor(HexColor("#fdecea"))
+            c.setFillColor(RED_BG)
             c.rect(margin, y - box_h, box_w, box_h, fill=True, stroke=False)
             c.setStrokeColor(RED)
             c.setLineWidth(2)
@@ -2992,7 +3742,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         if note:
             y -= 6
             c.setFillColor(GRAY)
-            for line in wrap_text(note, font_en, 7, WIDTH - 2 * margin - 10):
+            for line in _wrap_text(note, font_en, 7, WIDTH - 2 * margin - 10):
                 pick_font(line, 7)
                 c.drawString(margin + 5, y, line)
                 y -= 10
@@ -3008,7 +3758,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         explanation = mng.get("explanation_en", "")
         if explanation:
             c.setFillColor(GRAY)
-            for line in wrap_text(explanation, font_en, 7.5, WIDTH - 2 * margin - 10):
+            for line in _wrap_text(explanation, font_en, 7.5, WIDTH - 2 * margin - 10):
                 pick_font(line, 7.5)
                 c.drawString(margin + 5, y, line)
                 y -= 11
@@ -3029,7 +3779,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             example = opt.get("example", "")
             if example:
                 c.setFillColor(NAVY)
-                for line in wrap_text(example, font_ja, 7.5, WIDTH - 2 * margin - 25):
+                for line in _wrap_text(example, font_ja, 7.5, WIDTH - 2 * margin - 25):
                     pick_font(line, 7.5)
                     c.drawString(margin + 15, y, line)
                     y -= 10
@@ -3037,8 +3787,8 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             # Note
             note = opt.get("note", "")
             if note:
-                c.setFillColor(HexColor("#444444"))
-                for line in wrap_text(note, font_en, 6.5, WIDTH - 2 * margin - 25):
+                c.setFillColor(DARK_GRAY)
+                for line in _wrap_text(note, font_en, 6.5, WIDTH - 2 * margin - 25):
                     pick_font(line, 6.5)
                     c.drawString(margin + 15, y, line)
                     y -= 9
@@ -3057,22 +3807,20 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 y = HEIGHT - 60
 
             # Tip heading (bold-style)
-            c.setFillColor(NAVY)
-            c.setFont(font_en, 8.5)
             tip_heading = f"{i + 1}. {tip['tip_en']}"
-            for line in wrap_text(tip_heading, font_en, 8.5, WIDTH - 2 * margin - 15):
-                c.drawString(margin, y, line)
+            for line in _wrap_text(tip_heading, font_en, 8.5, WIDTH - 2 * margin - 15):
+                queue_text(NAVY, font_en, 8.5, margin, y, line)
                 y -= 12
             y -= 2
 
             # Detail
-            c.setFillColor(HexColor("#444444"))
-            for line in wrap_text(tip["detail_en"], font_en, 7, WIDTH - 2 * margin - 25):
-                pick_font(line, 7)
-                c.drawString(margin + 15, y, line)
+            for line in _wrap_text(tip["detail_en"], font_en, 7, WIDTH - 2 * margin - 25):
+                queue_text(DARK_GRAY, text_font(line), 7, margin + 15, y, line)
                 y -= 10
             y -= 10
 
+        flush_text()
+
     # ═══ Rejection Handling Page ═══
     rejection = form_template.get("rejection_handling", {})
     if rejection:
@@ -3084,7 +3832,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         explanation = rejection.get("explanation_en", "")
         if explanation:
             c.setFillColor(GRAY)
-            for line in wrap_text(explanation, font_en, 7.5, WIDTH - 2 * margin - 10):
+            for line in _wrap_text(explanation, font_en, 7.5, WIDTH - 2 * margin - 10):
                 pick_font(line, 7.5)
                 c.drawString(margin + 5, y, line)
                 y -= 11
@@ -3102,15 +3850,12 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 if y < 60:
                     new_page()
                     y = HEIGHT - 60
-                c.setFillColor(RED)
-                c.setFont(font_en, 7.5)
-                c.drawString(margin + 5, y, f"{i + 1}.")
-                c.setFillColor(NAVY)
-                for line in wrap_text(reason, font_en, 7.5, WIDTH - 2 * margin - 30):
-                    pick_font(line, 7.5)
-                    c.drawString(margin + 20, y, line)
+                queue_text(RED, font_en, 7.5, margin + 5, y, f"{i + 1}.")
+                for line in _wrap_text(reason, font_en, 7.5, WIDTH - 2 * margin - 30):
+                    queue_text(NAVY, text_font(line), 7.5, margin + 20, y, line)
                     y -= 11
                 y -= 4
+            flush_text()
             y -= 8
 
         # Next steps — bulleted action list
@@ -3125,15 +3870,12 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 if y < 60:
                     new_page()
                     y = HEIGHT - 60
-                c.setFillColor(GREEN)
-                c.setFont(font_en, 7)
-                c.drawString(margin + 5, y + 2, "\u25b6")
-                c.setFillColor(HexColor("#444444"))
-                for line in wrap_text(step, font_en, 7, WIDTH - 2 * margin - 25):
-                    pick_font(line, 7)
-                    c.drawString(margin + 18, y, line)
+                queue_text(GREEN, font_en, 7, margin + 5, y + 2, "\u25b6")
+                for line in _wrap_text(step, font_en, 7, WIDTH - 2 * margin - 25):
+                    queue_text(DARK_GRAY, text_font(line), 7, margin + 18, y, line)
                     y -= 10
                 y -= 4
+            flush_text()
 
     # ═══ Counter Phrases Page ═══
     phrases = form_template.get("counter_phrases", [])
@@ -3153,9 +3895,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
                 y = HEIGHT - 60
 
             # Situation label
-            c.setFillColor(BLUE)
-            c.setFont(font_en, 7)
-            c.drawString(margin, y, p["situation_en"].upper())
+            queue_text(BLUE, font_en, 7, margin, y, p["situation_en"].upper())
             y -= 3
 
             # Phrase card
@@ -3167,23 +3907,19 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             c.line(margin, y - card_h, margin, y)
 
             # Japanese (large)
-            c.setFillColor(NAVY)
-            c.setFont(font_ja, 12)
-            c.drawString(margin + 8, y - 15, p["ja"])
+            queue_text(NAVY, font_ja, 12, margin + 8, y - 15, p["ja"])
 
             # Romaji
-            c.setFillColor(GRAY)
             romaji_text = p.get("romaji", "")
-            pick_font(romaji_text, 6.5)
-            c.drawString(margin + 8, y - 25, romaji_text)
+            queue_text(GRAY, text_font(romaji_text), 6.5, margin + 8, y - 25, romaji_text)
 
             # English
-            c.setFillColor(BLUE)
-            pick_font(p["en"], 7)
-            c.drawString(margin + 8, y - 35, p["en"])
+            queue_text(BLUE, text_font(p["en"]), 7, margin + 8, y - 35, p["en"])
 
             y -= card_h + 12
 
+        flush_text()
+
     # ═══ After Submission Page ═══
     after = form_template.get("after_submission", [])
     if after:
@@ -3202,24 +3938,20 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             cx = margin + 10
             cy = y + 3
             c.circle(cx, cy, 8, fill=True, stroke=False)
-            c.setFillColor(WHITE)
-            c.setFont(font_en, 8)
-            c.drawCentredString(cx, cy - 3, str(step_num))
+            queue_text(WHITE, font_en, 8, cx, cy - 3, str(step_num), centred=True)
 
             # Japanese
-            c.setFillColor(NAVY)
-            c.setFont(font_ja, 9)
-            c.drawString(margin + 25, y + 2, step.get("ja", ""))
+            queue_text(NAVY, font_ja, 9, margin + 25, y + 2, step.get("ja", ""))
             y -= 14
 
             # English
-            c.setFillColor(GRAY)
-            for line in wrap_text(step.get("en", ""), font_en, 7.5, WIDTH - 2 * margin - 30):
-                pick_font(line, 7.5)
-                c.drawString(margin + 25, y, line)
+            for line in _wrap_text(step.get("en", ""), font_en, 7.5, WIDTH - 2 * margin - 30):
+                queue_text(GRAY, text_font(line), 7.5, margin + 25, y, line)
                 y -= 10
             y -= 8
 
+        flush_text()
+
         # Mailing address
         mailing = form_template.get("mailing_address", {})
         if mailing:
@@ -3281,7 +4013,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
             new_page()
             y = HEIGHT - 60
         y -= 10
-        c.setStrokeColor(HexColor("#bdc3c7"))
+        c.setStrokeColor(RULE_GRAY)
         c.setLineWidth(0.5)
         c.line(margin, y, WIDTH - margin, y)
         y -= 14
@@ -3290,12 +4022,12 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
         c.drawString(margin, y, "SOURCE ATTRIBUTION")
         y -= 12
         c.setFont(font_en, 6)
-        for line in wrap_text(source_note, font_en, 6, WIDTH - 2 * margin):
+        for line in _wrap_text(source_note, font_en, 6, WIDTH - 2 * margin):
             c.drawString(margin, y, line)
             y -= 9
 
     c.save()
-    print(f"    Generated {output_path.name}")
+    logger.info("    Generated %s", output_path.name)
     return output_path
 
 
@@ -3304,7 +4036,7 @@ def generate_template_walkthrough(form_template, dictionary, output_path):
 # ═══════════════════════════════════════════
 
 def process_pdf(pdf_path, output_dir, form_id="residence_registration",
-                use_llm=True, zones=None):
+                use_llm=True, zones=None, dpi=200, use_image_cache=True):
     """
     Main entry point: process a single PDF and generate a bilingual guide.
 
@@ -3316,6 +4048,12 @@ def process_pdf(pdf_path, output_dir, form_id="residence_registration",
         form_id: Form template ID (default: residence_registration)
         use_llm: Whether to use Claude API for unknown terms
         zones: List of zone dicts (default: DEFAULT_ZONES for 住民異動届)
+        dpi: Resolution for rendered page images (OCR and guide embedding)
+        use_image_cache: Reuse/store rendered pages in PAGE_IMAGE_CACHE_DIR
+
+    Progress is reported through the module logger at INFO level. Library
+    callers must call configure_logging() (or attach their own handler) to
+    see it; without one, only warnings and errors reach stderr.
     """
     pdf_path = str(pdf_path)
     output_dir = Path(output_dir)
@@ -3381,7 +4119,7 @@ def process_pdf(pdf_path, output_dir, form_id="residence_registration",
     else:
         output_path = output_dir / f"{pdf_name}_walkthrough.pdf"
 
-    print(f"  Pipeline: {Path(pdf_path).name}")
+    logger.info("  Pipeline: %s", Path(pdf_path).name)
 
     # Load data
     dictionary = load_field_dictionary()
@@ -3389,256 +4127,290 @@ def process_pdf(pdf_path, output_dir, form_id="residence_registration",
     cache = load_translation_cache()
 
     if not form_template:
-        print(f"    WARN: Form template '{form_id}' not found. Generating without template content.")
+        logger.warning("    Form template '%s' not found. Generating without template content.", form_id)
+
+    # Read the PDF once: page sizes, classification, chars and validation text
+    MIN_CHARS_FOR_TEXT = 50
+    validation_terms = _validation_terms(form_template) if form_template else []
+    try:
+        pages = analyze_pdf(pdf_path, min_chars=MIN_CHARS_FOR_TEXT, include_text=bool(validation_terms))
+        read_error = None
+    except Exception as e:
+        pages = []
+        read_error = e
 
     # Pre-flight: validate PDF matches expected form type
     if form_template:
-        passed, detail = validate_pdf_for_form(pdf_path, form_template)
+        if not validation_terms:
+            passed, detail = (True, "no validation terms defined — skipping")
+        elif read_error is not None:
+            passed, detail = (True, f"could not read PDF — skipping validation ({read_error})")
+        else:
+            passed, detail = _match_validation_terms("".join(p["text"] for p in pages), validation_terms)
         if not passed:
-            print(f"    SKIP: PDF does not match form type '{form_id}' — {detail}")
+            logger.warning("    Skipping: PDF does not match form type '%s' — %s", form_id, detail)
             return None
         else:
-            print(f"    Validated: {detail}")
+            logger.info("    Validated: %s", detail)
 
-    # Step 1: Get page count and extract text from ALL pages
-    print(f"    Extracting text...")
-    import pdfplumber
+    if read_error is not None:
+        raise read_error
 
-    num_pages = 1
-    page_heights = []
-    page_widths = []
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            num_pages = len(pdf.pages)
-            page_heights = [float(p.height) for p in pdf.pages]
-            page_widths = [float(p.width) for p in pdf.pages]
-    except Exception:
-        page_heights = [842]  # A4 default
-        page_widths = [595]   # A4 default
+    # Step 1: Get page count and extract text from ALL pages
+    logger.info("    Extracting text...")
+    num_pages = len(pages)
+    page_heights = [p["height_pts"] for p in pages]
+    page_widths = [p["width_pts"] for p in pages]
 
     # Extract and cluster fields from each page
-    all_fields = []  # List of (page_num, fields_list, is_ocr)
+    page_fields_kept = []  # fields from every page, tagged and filtered as each page is read
     ocr_translations = {}  # Pre-computed translations from OCR workflow
     total_chars = 0
-    ocr_stats = {"dict_hits": 0, "frag_hits": 0, "llm_hits": 0, "unknown": 0}
+    type_counts = Counter()  # translation type -> count, across OCR and text pages
+    rendered_pages = {}  # page_num -> PIL.Image, reused by Step 5 instead of re-rendering
+
+    # Pages were classified (text vs image) by analyze_pdf
+    text_pages = sum(1 for p in pages if p["type"] == "text")
+    image_pages = sum(1 for p in pages if p["type"] == "image")
+    logger.info("    Page classification: %d text-based, %d image-based", text_pages, image_pages)
+
+    # Image-based pages (< MIN_CHARS_FOR_TEXT chars) are rendered and run
+    # through OCR + Vision + translation — mostly waiting on the network — so
+    # process them concurrently, then merge in page order below
+    def ocr_page(page_num):
+        char_count = pages[page_num]["char_count"]
+        page_image_for_ocr = render_page_image(pdf_path, page_num=page_num, dpi=dpi, use_cache=use_image_cache)
+        if not (page_image_for_ocr and use_llm):
+            return page_image_for_ocr, None
+        page_label = f"image ({char_count} chars)" if char_count else "image"
+        logger.info("    Page %d [%s]: Using OCR workflow...", page_num + 1, page_label)
+        return page_image_for_ocr, ocr_extract_translate_locate(
+            page_image_for_ocr,
+            page_width_pts=pages[page_num]["width_pts"],
+            page_height_pts=pages[page_num]["height_pts"],
+            dictionary=dictionary,
+            cache=cache,
+            use_llm=use_llm
+        )
 
-    # Classify pages upfront (text vs image)
-    MIN_CHARS_FOR_TEXT = 50
-    page_classifications = classify_pdf_pages(pdf_path, min_chars=MIN_CHARS_FOR_TEXT)
-    text_pages = sum(1 for p in page_classifications if p["type"] == "text")
-    image_pages = sum(1 for p in page_classifications if p["type"] == "image")
-    print(f"    Page classification: {text_pages} text-based, {image_pages} image-based")
-
-    for page_num in range(num_pages):
-        chars = extract_text(pdf_path, page_num=page_num)
-        page_height_pts = page_heights[page_num] if page_num < len(page_heights) else 842
-        page_width_pts = page_widths[page_num] if page_num < len(page_widths) else 595
-        is_ocr_page = False
-
-        # Use OCR if page is classified as image-based (< MIN_CHARS_FOR_TEXT chars)
-        if len(chars) < MIN_CHARS_FOR_TEXT:
-            page_image_for_ocr = render_page_image(pdf_path, page_num=page_num, dpi=200)
-            if page_image_for_ocr and use_llm:
-                page_label = f"image ({len(chars)} chars)" if chars else "image"
-                print(f"    Page {page_num + 1} [{page_label}]: Using OCR workflow...")
-                fields, page_stats = ocr_extract_translate_locate(
-                    page_image_for_ocr,
-                    page_width_pts=page_width_pts,
-                    page_height_pts=page_height_pts,
-                    dictionary=dictionary,
-                    cache=cache,
-                    use_llm=use_llm
-                )
-                is_ocr_page = True
-                # Accumulate OCR stats
-                for k in ocr_stats:
-                    ocr_stats[k] += page_stats.get(k, 0)
-                # Store pre-computed translations
-                for f in fields:
-                    if "translation" in f:
-                        ocr_translations[f["text"]] = f["translation"]
+    ocr_page_nums = [p["page"] for p in pages if p["char_count"] < MIN_CHARS_FOR_TEXT]
+    # Text pages still need a render for the guide (Step 5); unless it is
+    # already cached, start it now so poppler overlaps with field extraction
+    # and translation instead of running serially at the end
+    render_page_nums = [
+        p["page"] for p in pages
+        if p["char_count"] >= MIN_CHARS_FOR_TEXT
+        and not (use_image_cache and _cached_page_image_path(pdf_path, p["page"], dpi))
+    ]
+    ocr_futures = {}
+    render_futures = {}
+    executor = None
+    try:
+        if ocr_page_nums or render_page_nums:
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(max_workers=min(OCR_MAX_WORKERS, len(ocr_page_nums) + len(render_page_nums)))
+            ocr_futures = {page_num: executor.submit(ocr_page, page_num) for page_num in ocr_page_nums}
+            render_futures = {
+                page_num: executor.submit(render_page_image, pdf_path, page_num=page_num, dpi=dpi, use_cache=use_image_cache)
+                for page_num in render_page_nums
+            }
+
+        for page_num in range(num_pages):
+            chars = pages[page_num]["chars"]
+            char_count = pages[page_num]["char_count"]
+            is_ocr_page = False
+
+            # Use OCR if page is classified as image-based (< MIN_CHARS_FOR_TEXT chars)
+            if char_count < MIN_CHARS_FOR_TEXT:
+                page_image_for_ocr, ocr_result = ocr_futures[page_num].result()
+                rendered_pages[page_num] = page_image_for_ocr
+                if ocr_result is not None:
+                    fields, page_stats = ocr_result
+                    is_ocr_page = True
+                    # Accumulate OCR stats
+                    type_counts.update({
+                        "dictionary": page_stats.get("dict_hits", 0),
+                        "fragment": page_stats.get("frag_hits", 0),
+                        "llm": page_stats.get("llm_hits", 0),
+                        "unknown": page_stats.get("unknown", 0),
+                    })
+                    # Store pre-computed translations, keyed by the stripped text
+                    # that the zone loop looks up
+                    for f in fields:
+                        if "translation" in f:
+                            ocr_translations[f["text"].strip()] = f["translation"]
+                else:
+                    fields = []
             else:
-                fields = []
-        else:
-            print(f"    Page {page_num + 1} [text ({len(chars)} chars)]: Extracting fields...")
-            fields = cluster_fields(chars)
+                logger.info("    Page %d [text (%d chars)]: Extracting fields...", page_num + 1, char_count)
+                fields = cluster_fields(chars)
 
-        if fields:
-            # Keep original y-coordinates, just track page number and OCR flag
+            if fields:
+                # Keep original y-coordinates, just track page number and OCR flag.
+                # Empty / single-character groups (stray glyphs, checkbox marks) are
+                # dropped in the same pass rather than in a second loop or per zone
+                for f in fields:
+                    f["page"] = page_num
+                    f["is_ocr"] = is_ocr_page
+                    f["text"] = f["text"].strip()
+                    if len(f["text"]) >= 2:
+                        page_fields_kept.append(f)
+                total_chars += char_count if char_count else sum(f.get("char_count", 0) for f in fields)
+                logger.info("    Page %d: %s, %d fields", page_num + 1, char_count or "OCR", len(fields))
+
+        # Deduplicate fields that occupy similar positions (prevents duplicate annotations)
+        fields_before = len(page_fields_kept)
+        fields = deduplicate_fields(page_fields_kept)
+        if len(fields) < fields_before:
+            logger.info("    Deduplicated: %d → %d fields", fields_before, len(fields))
+
+        logger.info("    Found %d characters across %d page(s)", total_chars, num_pages)
+        logger.info("    Clustered into %d field groups", len(fields))
+
+        # Use first page height for zone mapping (zones are relative to page)
+        page_height_pts = page_heights[0] if page_heights else 842
+
+        # Use dynamic zones for OCR fields or non-residence form types
+        has_ocr_fields = any(f.get("is_ocr", False) for f in fields)
+        if has_ocr_fields or use_dynamic_zones:
+            # Create dynamic zones based on actual field positions
+            # Group fields by page first
+            fields_by_page = {}
             for f in fields:
-                f["page"] = page_num
-                f["is_ocr"] = is_ocr_page
-            all_fields.append((page_num, fields, page_height_pts))
-            total_chars += len(chars) if chars else sum(f.get("char_count", 0) for f in fields)
-            print(f"    Page {page_num + 1}: {len(chars) if chars else 'OCR'}, {len(fields)} fields")
-
-    # Combine all fields for translation
-    fields = []
-    for page_num, page_fields, _ in all_fields:
-        fields.extend(page_fields)
-
-    # Deduplicate fields that occupy similar positions (prevents duplicate annotations)
-    fields_before = len(fields)
-    fields = deduplicate_fields(fields)
-    if len(fields) < fields_before:
-        print(f"    Deduplicated: {fields_before} → {len(fields)} fields")
-
-    print(f"    Found {total_chars} characters across {num_pages} page(s)")
-    print(f"    Clustered into {len(fields)} field groups")
-
-    # Use first page height for zone mapping (zones are relative to page)
-    page_height_pts = page_heights[0] if page_heights else 842
-
-    # Use dynamic zones for OCR fields or non-residence form types
-    has_ocr_fields = any(f.get("is_ocr", False) for f in fields)
-    if has_ocr_fields or use_dynamic_zones:
-        # Create dynamic zones based on actual field positions
-        # Group fields by page first
-        fields_by_page = {}
-        for f in fields:
-            page = f.get("page", 0)
-            if page not in fields_by_page:
-                fields_by_page[page] = []
-            fields_by_page[page].append(f)
-
-        # Create zones for each page's fields
-        dynamic_zones = []
-        for page_num in sorted(fields_by_page.keys()):
-            page_fields = fields_by_page[page_num]
-            page_h = page_heights[page_num] if page_num < len(page_heights) else 842
-            # OCR forms need smaller zones (fields are noisier); text-based forms
-            # can use larger zones to avoid excessive page count
-            zone_size = 12 if has_ocr_fields else 20
-            page_zones = create_dynamic_zones_for_fields(page_fields, page_h, max_fields_per_zone=zone_size)
-            # Tag zones with page number
-            for z in page_zones:
-                z["page"] = page_num
-                z["name"] = f"Page {page_num + 1} - {z['name']}"
-            dynamic_zones.extend(page_zones)
-
-        if dynamic_zones:
-            zones = dynamic_zones
-            reason = "OCR content" if has_ocr_fields else f"non-residence form ({form_id})"
-            print(f"    Using {len(zones)} dynamic zones for {reason}")
-
-    # Step 4: Translate fields by zone
-    # Use pre-computed translations for OCR fields, regular translation for text-based
-    print(f"    Translating fields...")
-    translations_by_zone = {}
-    dict_hits = ocr_stats["dict_hits"]  # Start with OCR stats
-    frag_hits = ocr_stats["frag_hits"]
-    llm_hits = ocr_stats["llm_hits"]
-    unknown = ocr_stats["unknown"]
-
-    for zone in zones:
-        zone_fields = fields_in_zone(fields, zone)
-        zone_translations = []
-
-        for field in zone_fields:
-            text = field["text"].strip()
-            if not text or len(text) < 2:
-                continue
+                page = f.get("page", 0)
+                if page not in fields_by_page:
+                    fields_by_page[page] = []
+                fields_by_page[page].append(f)
+
+            # Create zones for each page's fields
+            dynamic_zones = []
+            for page_num in sorted(fields_by_page.keys()):
+                page_fields = fields_by_page[page_num]
+                page_h = page_heights[page_num] if page_num < len(page_heights) else 842
+                # OCR forms need smaller zones (fields are noisier); text-based forms
+                # can use larger zones to avoid excessive page count
+                zone_size = 12 if has_ocr_fields else 20
+                page_zones = create_dynamic_zones_for_fields(page_fields, page_h, max_fields_per_zone=zone_size)
+                # Tag zones with page number
+                for z in page_zones:
+                    z["page"] = page_num
+                    z["name"] = f"Page {page_num + 1} - {z['name']}"
+                dynamic_zones.extend(page_zones)
+
+            if dynamic_zones:
+                zones = dynamic_zones
+                reason = "OCR content" if has_ocr_fields else f"non-residence form ({form_id})"
+                logger.info("    Using %d dynamic zones for %s", len(zones), reason)
+
+        # Step 4: Translate fields by zone
+        # Use pre-computed translations for OCR fields, regular translation for text-based
+        logger.info("    Translating fields...")
+        translations_by_zone = {}
+        zone_fields_list, catch_zone, unassigned = assign_fields_to_zones(fields, zones)
+
+        zone_groups = []  # (zone, fields to translate), in zone order
+        for zone, zone_fields in zip(zones, zone_fields_list):
             # Skip short fragments without kanji (e.g. "す。", "くだ", "の世")
             # Useful short fields like "氏名", "住所" always contain kanji
-            if len(text) <= 3 and not any('\u4e00' <= ch <= '\u9fff' for ch in text):
-                continue
+            zone_groups.append((zone, [
+                field for field in zone_fields
+                if len(field["text"]) > 3 or any('\u4e00' <= ch <= '\u9fff' for ch in field["text"])
+            ]))
+
+        # Collect any fields that fell outside defined zones
+        if unassigned:
+            logger.info("    Found %d fields outside defined zones", len(unassigned))
+            zone_groups.append((catch_zone, unassigned))
+
+        # Text-based fields (no OCR translation) are translated in one batch across
+        # every zone, so all dictionary misses share one LLM round trip
+        pending = [
+            field["text"] for _, zone_fields in zone_groups for field in zone_fields
+            if not (ocr_translations.get(field["text"]) or field.get("translation"))
+        ]
+        batch_results = iter(translate_fields_batch(pending, cache, dictionary, use_llm=use_llm))
+
+        for zone, zone_fields in zone_groups:
+            zone_translations = []
+            for field in zone_fields:
+                text = field["text"]
+
+                # Check for pre-computed OCR translation first, then one embedded
+                # in the field by the OCR workflow
+                result = ocr_translations.get(text) or field.get("translation")
+                if not result:
+                    result = next(batch_results)
+                    type_counts[result.get("type", "")] += 1
+
+                zone_translations.append({
+                    "ja": text,
+                    "en": result.get("en", ""),
+                    "type": result.get("type", "unknown"),
+                    "note": result.get("note", ""),
+                    "x0": field["x0"],
+                    "y0": field["y0"],
+                    "page": field.get("page", 0),
+                    "is_ocr": field.get("is_ocr", False),
+                })
 
-            # Check for pre-computed OCR translation first
-            if text in ocr_translations:
-                result = ocr_translations[text]
-            elif field.get("translation"):
-                # Translation embedded in field from OCR workflow
-                result = field["translation"]
+            if zone is catch_zone:
+                if zone_translations:
+                    translations_by_zone[catch_zone["name"]] = zone_translations
+                    zones = zones + [catch_zone]  # Add to zones list for rendering
             else:
-                # Regular translation for text-based fields
-                result = translate_field(text, cache, dictionary, use_llm=use_llm)
-                t = result.get("type", "")
-                if t == "dictionary":
-                    dict_hits += 1
-                elif t == "fragment":
-                    frag_hits += 1
-                elif t == "llm":
-                    llm_hits += 1
-                elif t == "unknown":
-                    unknown += 1
-
-            zone_translations.append({
-                "ja": text,
-                "en": result.get("en", ""),
-                "type": result.get("type", "unknown"),
-                "note": result.get("note", ""),
-                "x0": field["x0"],
-                "y0": field["y0"],
-                "page": field.get("page", 0),
-                "is_ocr": field.get("is_ocr", False),
-            })
-
-        translations_by_zone[zone["name"]] = zone_translations
-
-    # Collect any fields that fell outside defined zones
-    catch_zone, unassigned = collect_unassigned_fields(fields, zones)
-    if unassigned:
-        print(f"    Found {len(unassigned)} fields outside defined zones")
-        zone_translations = []
-        for field in unassigned:
-            text = field["text"].strip()
-            if not text or len(text) < 2:
-                continue
-
-            # Check for pre-computed OCR translation first
-            if text in ocr_translations:
-                result = ocr_translations[text]
-            elif field.get("translation"):
-                result = field["translation"]
+                translations_by_zone[zone["name"]] = zone_translations
+
+        dict_hits = type_counts["dictionary"]
+        frag_hits = type_counts["fragment"]
+        llm_hits = type_counts["llm"]
+        unknown = type_counts["unknown"]
+        total = dict_hits + frag_hits + llm_hits + unknown
+        logger.info("    Translations: %d dictionary, %d fragment, %d LLM, %d unknown (of %d)",
+                    dict_hits, frag_hits, llm_hits, unknown, total)
+
+        # Save cache after translating
+        save_translation_cache(cache)
+
+        # Step 5: Collect page images for ALL pages (OCR pages were rendered by
+        # their workers, uncached text pages in the background since Step 1)
+        logger.info("    Rendering page image(s)...")
+        # Pages already in the render cache are passed to generate_guide as paths
+        # and decoded there on demand, rather than all held decoded up front
+        page_images = []
+        for page_num in range(num_pages):
+            if page_num in rendered_pages:
+                img = rendered_pages.pop(page_num)
+            elif page_num in render_futures:
+                img = render_futures.pop(page_num).result()
             else:
-                result = translate_field(text, cache, dictionary, use_llm=use_llm)
-                t = result.get("type", "")
-                if t == "dictionary":
-                    dict_hits += 1
-                elif t == "fragment":
-                    frag_hits += 1
-                elif t == "llm":
-                    llm_hits += 1
-                elif t == "unknown":
-                    unknown += 1
-
-            zone_translations.append({
-                "ja": text,
-                "en": result.get("en", ""),
-                "type": result.get("type", "unknown"),
-                "note": result.get("note", ""),
-                "x0": field["x0"],
-                "y0": field["y0"],
-                "page": field.get("page", 0),
-                "is_ocr": field.get("is_ocr", False),
-            })
-        if zone_translations:
-            translations_by_zone[catch_zone["name"]] = zone_translations
-            zones = zones + [catch_zone]  # Add to zones list for rendering
-
-    total = dict_hits + frag_hits + llm_hits + unknown
-    print(f"    Translations: {dict_hits} dictionary, {frag_hits} fragment, {llm_hits} LLM, {unknown} unknown (of {total})")
-
-    # Save cache after translating
-    save_translation_cache(cache)
-
-    # Step 5: Render page images for ALL pages
-    print(f"    Rendering page image(s)...")
-    page_images = []
-    for page_num in range(num_pages):
-        img = render_page_image(pdf_path, page_num=page_num, dpi=200)
-        if img:
-            page_images.append((page_num, img))
-            print(f"    Page {page_num + 1}: {img.size[0]}x{img.size[1]} px")
+                img = _cached_page_image_path(pdf_path, page_num, dpi) if use_image_cache else None
+                if img is None:
+                    img = render_page_image(pdf_path, page_num=page_num, dpi=dpi, use_cache=use_image_cache)
+            if img:
+                page_images.append((page_num, img))
+                if isinstance(img, Path):
+                    from PIL import Image
+                    with Image.open(img) as cached:  # reads the header only
+                        size = cached.size
+                else:
+                    size = img.size
+                logger.info("    Page %d: %dx%d px", page_num + 1, size[0], size[1])
+    finally:
+        # The pool ends here even when something above raised (a failed OCR
+        # page, clustering, translation): queued jobs are cancelled and running
+        # ones finish, so none keep calling Claude or writing into the shared
+        # cache after process_pdf returns
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     if not page_images:
-        print(f"    WARN: Could not render any page images (poppler may not be installed)")
+        logger.warning("    Could not render any page images (poppler may not be installed)")
 
     # For backward compatibility, use first image as primary
     page_image = page_images[0][1] if page_images else None
 
     # Step 6: Generate guide PDF
-    print(f"    Generating guide PDF...")
+    logger.info("    Generating guide PDF...")
     result = generate_guide(
         pdf_path=pdf_path,
         translations_by_zone=translations_by_zone,
@@ -3660,7 +4432,7 @@ def process_pdf(pdf_path, output_dir, form_id="residence_registration",
 
     if result:
         size_kb = output_path.stat().st_size / 1024
-        print(f"    OK: {output_path.name} ({size_kb:.0f} KB)")
+        logger.info("    OK: %s (%.0f KB)", output_path.name, size_kb)
         return {
             "path": str(output_path),
             "stats": {
@@ -3672,7 +4444,7 @@ def process_pdf(pdf_path, output_dir, form_id="residence_registration",
             }
         }
     else:
-        print(f"    FAIL: Could not generate guide")
+        logger.error("    Could not generate guide")
         return None
 
 
@@ -3698,8 +4470,13 @@ def main():
                         help="Generate walkthrough from template only (no PDF input)")
     parser.add_argument("--validate", action="store_true",
                         help="Validate PDF(s) match the form type, then exit (no generation)")
+    parser.add_argument("--no-image-cache", action="store_true",
+                        help=f"Re-render page images instead of using {PAGE_IMAGE_CACHE_DIR.relative_to(BASE_DIR)}")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Only show warnings and errors from the pipeline")
 
     args = parser.parse_args()
+    configure_logging(quiet=args.quiet)
 
     # ── Template-only mode ──
     if args.template_only:
@@ -3809,6 +4586,8 @@ def main():
         output_dir=str(output_dir),
         form_id=args.form,
         use_llm=use_llm,
+        dpi=args.dpi,
+        use_image_cache=not args.no_image_cache,
     )
 
     if result:
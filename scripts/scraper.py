@@ -1461,11 +1461,12 @@ def run_generate(form_type="residence", prefecture="tokyo", registry=None,
     """
     if not dry_run:
         try:
-            from pipeline import process_pdf
+            from pipeline import process_pdf, configure_logging
         except ImportError:
             print("ERROR: pipeline.py not found. Cannot run --generate.")
             print("  Place pipeline.py in the scripts/ directory.")
             return
+        configure_logging()
 
     if registry is None:
         registry = get_active_registry(prefecture)